@@ -0,0 +1,273 @@
+import asyncio
+import io
+import json
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api.multipart import MultipartParser, RequestTooLargeError, parse_boundary
+from app.api.routes import RequestTimeoutError, fuse_results, model_registry, predict
+from app.metrics import request_latency, timed
+from app.models.registry import ModelUnavailableError
+from config import ASGI_WORKER_THREADS, MAX_UPLOAD_BYTES, REQUEST_TIMEOUT_SECONDS
+
+# path -> (endpoint label, modality, form field, missing-file message, response message)
+UPLOAD_ROUTES = {
+    '/api/face': ('api.face_analysis', 'face', 'image', 'No image file', 'Face analysis completed'),
+    '/api/arm': ('api.arm_analysis', 'arm', 'csv', 'No CSV files', 'Arm analysis completed'),
+    '/api/speech': ('api.speech_analysis', 'speech', 'audio', 'No Audio file', 'Speech analysis completed'),
+}
+
+
+class StrokeASGIApp:
+    """asyncio front end for the upload endpoints.
+
+    ``/api/face``, ``/api/arm``, ``/api/speech``, ``/api/assess`` and
+    ``/api/ready`` are served natively: the multipart body is parsed while it
+    streams in, so a slow upload only holds a coroutine, and preprocessing and
+    inference run on a thread pool. ``/api/speech/stream`` takes a raw WAV
+    body and preprocesses each chunk as it arrives. Every other request is passed to
+    ``wsgi_app`` (the Flask app) on the same pool once its body has arrived.
+    Predictions that take longer than ``request_timeout`` seconds (0 = no
+    limit) get 504.
+    """
+
+    def __init__(self, wsgi_app=None, max_body_size=MAX_UPLOAD_BYTES, worker_threads=ASGI_WORKER_THREADS,
+                 request_timeout=REQUEST_TIMEOUT_SECONDS):
+        self.wsgi_app = wsgi_app
+        self.max_body_size = max_body_size
+        self.request_timeout = request_timeout
+        self.executor = ThreadPoolExecutor(max_workers=worker_threads, thread_name_prefix='asgi-worker')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        start = time.perf_counter()
+        method, path = scope['method'], scope['path']
+        if method == 'POST' and path in UPLOAD_ROUTES:
+            endpoint = UPLOAD_ROUTES[path][0]
+            status = await self.upload(scope, receive, send, *UPLOAD_ROUTES[path][1:])
+        elif method == 'POST' and path == '/api/speech/stream':
+            endpoint = 'api.speech_stream_analysis'
+            status = await self.speech_stream(scope, receive, send)
+        elif method == 'POST' and path == '/api/assess':
+            endpoint = 'api.assess'
+            status = await self.assess(scope, receive, send)
+        elif method == 'GET' and path == '/api/ready':
+            endpoint = 'api.readiness'
+            ready = model_registry.ready()
+            status = await self.send_json(send, 200 if ready else 503,
+                                          {"ready": ready, "models": model_registry.status()})
+        elif self.wsgi_app is not None:
+            # WSGI 앱이 기록
+            await self.call_wsgi(scope, receive, send)
+            return
+        else:
+            endpoint = 'unknown'
+            status = await self.send_json(send, 404, {"error": "Not Found"})
+
+        request_latency.observe(time.perf_counter() - start, endpoint, status)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def run_with_deadline(self, func, *args):
+        # 시간 초과된 작업은 중단할 수 없으므로 pool 스레드에서 끝까지 실행됨
+        try:
+            return await asyncio.wait_for(self.run(func, *args), self.request_timeout or None)
+        except asyncio.TimeoutError:
+            raise RequestTimeoutError(
+                f"Request did not finish within {self.request_timeout:g} seconds") from None
+
+    @staticmethod
+    async def send_json(send, status, payload):
+        body = json.dumps(payload).encode()
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+        return status
+
+    async def read_files(self, scope, receive, modality):
+        """Streams the request body into a multipart parser; returns the uploaded files."""
+        headers = dict(scope.get('headers') or [])
+        boundary = parse_boundary(headers.get(b'content-type', b'').decode('latin-1'))
+        content_length = headers.get(b'content-length')
+        if content_length is not None and int(content_length) > self.max_body_size:
+            raise RequestTooLargeError(f"Request body exceeds {self.max_body_size} bytes")
+
+        with timed(modality, 'parse'):
+            parser = None
+            if boundary is not None:
+                parser = MultipartParser(boundary, self.max_body_size,
+                                         int(content_length) if content_length is not None else None)
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    raise ConnectionError("Client disconnected during upload")
+                if parser is not None:
+                    parser.feed(message.get('body', b''))
+                more_body = message.get('more_body', False)
+
+            if parser is None:
+                # multipart가 아니면 Flask와 같이 업로드 파일 없음으로 처리
+                return {}
+            parser.close()
+            return parser.fields()[0]
+
+    @staticmethod
+    async def error_response(send, error):
+        if isinstance(error, RequestTooLargeError):
+            return await StrokeASGIApp.send_json(send, 413, {"error": str(error)})
+        if isinstance(error, ModelUnavailableError):
+            return await StrokeASGIApp.send_json(send, 503, {"error": "Service Unavailable", "message": str(error)})
+        if isinstance(error, RequestTimeoutError):
+            return await StrokeASGIApp.send_json(send, 504, {"error": "Gateway Timeout", "message": str(error)})
+        return await StrokeASGIApp.send_json(send, 500, {
+            "error": "Internal Server Error",
+            "message": str(error),
+            "traceback": traceback.format_exc()
+        })
+
+    async def upload(self, scope, receive, send, modality, field, missing_message, message):
+        try:
+            files = await self.read_files(scope, receive, modality)
+            file = files.get(field)
+            if file is None:
+                return await self.send_json(send, 400, {'error': missing_message})
+            if file.filename == '':
+                return await self.send_json(send, 400, {'error': 'No selected file'})
+
+            result = await self.run_with_deadline(predict, modality, file)
+            return await self.send_json(send, 200, {"message": message, "result": result})
+        except Exception as e:
+            return await self.error_response(send, e)
+
+    async def assess(self, scope, receive, send):
+        try:
+            files = await self.read_files(scope, receive, 'assess')
+            tasks = {}
+            for name, field in [('face', 'image'), ('arm', 'csv'), ('speech', 'audio')]:
+                file = files.get(field)
+                if file is not None and file.filename != '':
+                    tasks[name] = file
+
+            if not tasks:
+                return await self.send_json(send, 400, {'error': 'No image, CSV or audio file'})
+
+            # modality별 전처리 + 추론을 동시에 실행
+            outcomes = await asyncio.gather(*[self.run_with_deadline(predict, name, file)
+                                              for name, file in tasks.items()],
+                                            return_exceptions=True)
+            results = {name: {"error": str(outcome)} if isinstance(outcome, Exception) else outcome
+                       for name, outcome in zip(tasks, outcomes)}
+
+            return await self.send_json(send, 200, {"message": "Stroke assessment completed",
+                                                    "results": results,
+                                                    "fused": fuse_results(results)})
+        except Exception as e:
+            return await self.error_response(send, e)
+
+    async def speech_stream(self, scope, receive, send):
+        try:
+            headers = dict(scope.get('headers') or [])
+            content_length = headers.get(b'content-length')
+            if content_length is not None and int(content_length) > self.max_body_size:
+                raise RequestTooLargeError(f"Request body exceeds {self.max_body_size} bytes")
+
+            # lazy 모드에서는 모델 로딩이 event loop를 막지 않도록 pool에서 실행
+            model = await self.run(model_registry.get, 'speech')
+            stream = model.open_stream()
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    raise ConnectionError("Client disconnected during upload")
+                chunk = message.get('body', b'')
+                if stream.bytes_received + len(chunk) > self.max_body_size:
+                    raise RequestTooLargeError(f"Request body exceeds {self.max_body_size} bytes")
+                if chunk:
+                    await self.run(stream.feed, chunk)
+                more_body = message.get('more_body', False)
+
+            if stream.bytes_received == 0:
+                return await self.send_json(send, 400, {'error': 'No Audio file'})
+
+            result = await self.run_with_deadline(model.predict_stream, stream)
+            return await self.send_json(send, 200, {"message": "Speech analysis completed", "result": result})
+        except Exception as e:
+            return await self.error_response(send, e)
+
+    async def call_wsgi(self, scope, receive, send):
+        body = io.BytesIO()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.write(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        body.seek(0)
+
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'],
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': (scope.get('server') or ('localhost', 80))[0],
+            'SERVER_PORT': str((scope.get('server') or ('localhost', 80))[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers') or []:
+            key = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                environ[key] = value
+            else:
+                key = f'HTTP_{key}'
+                environ[key] = f'{environ[key]},{value}' if key in environ else value
+
+        def call():
+            response = {}
+
+            def start_response(status, headers, exc_info=None):
+                response['status'] = int(status.split(' ', 1)[0])
+                response['headers'] = headers
+
+            iterable = self.wsgi_app(environ, start_response)
+            try:
+                content = b''.join(iterable)
+            finally:
+                if hasattr(iterable, 'close'):
+                    iterable.close()
+            return response['status'], response['headers'], content
+
+        status, headers, content = await self.run(call)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                for name, value in headers]})
+        await send({'type': 'http.response.body', 'body': content})
@@ -0,0 +1,167 @@
+class RequestTooLargeError(ValueError):
+    """The request body exceeds the configured upload limit."""
+
+
+class UploadFile:
+    """Read-only file over one part of a parsed multipart body.
+
+    ``read`` returns a ``memoryview`` into the request buffer instead of a
+    copy; ``np.frombuffer``, ``struct``, ``hashlib`` and ``str(data, 'utf-8')``
+    all accept it.
+    """
+
+    def __init__(self, data, filename, content_type=None):
+        self.data = data
+        self.filename = filename
+        self.content_type = content_type
+        self._pos = 0
+
+    def read(self, size=-1):
+        end = len(self.data) if size is None or size < 0 else min(len(self.data), self._pos + size)
+        chunk = self.data[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def seek(self, offset, whence=0):
+        base = {0: 0, 1: self._pos, 2: len(self.data)}[whence]
+        self._pos = max(0, min(len(self.data), base + offset))
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def seekable(self):
+        return True
+
+
+def _parse_header_params(value):
+    # 'form-data; name="image"; filename="face.jpg"' -> ('form-data', {...})
+    main, *params = value.split(';')
+    parsed = {}
+    for param in params:
+        key, _, val = param.strip().partition('=')
+        parsed[key.lower()] = val.strip().strip('"')
+    return main.strip().lower(), parsed
+
+
+def parse_boundary(content_type):
+    """Boundary of a ``multipart/form-data`` Content-Type header, or None."""
+    if not content_type:
+        return None
+    kind, params = _parse_header_params(content_type)
+    if kind != 'multipart/form-data' or not params.get('boundary'):
+        return None
+    return params['boundary'].encode('latin-1')
+
+
+class MultipartParser:
+    """Incremental ``multipart/form-data`` parser.
+
+    Chunks are copied into one buffer as they arrive (sized from
+    Content-Length when it is known, so it is allocated once) and the part
+    boundaries are located while the upload is still streaming in. Parts are
+    never copied out: ``files`` hands out ``memoryview`` slices of the buffer.
+    """
+
+    def __init__(self, boundary, max_size, size_hint=None):
+        self.max_size = max_size
+        self.buffer = bytearray(min(size_hint, max_size) if size_hint else 64 * 1024)
+        self.size = 0
+
+        self._delimiter = b'\r\n--' + boundary
+        self._state = 'preamble'
+        self._pos = 0
+        self._part_start = 0
+        self._part_headers = None
+        self._parts = []
+
+    @property
+    def done(self):
+        return self._state == 'done'
+
+    def feed(self, chunk):
+        if not chunk or self.done:
+            return
+        end = self.size + len(chunk)
+        if end > self.max_size:
+            raise RequestTooLargeError(f"Request body exceeds {self.max_size} bytes")
+        if end > len(self.buffer):
+            # Content-Length가 없을 때만 버퍼 확장
+            self.buffer.extend(bytes(max(end, 2 * len(self.buffer)) - len(self.buffer)))
+        self.buffer[self.size:end] = chunk
+        self.size = end
+        self._parse()
+
+    def _parse(self):
+        while True:
+            if self._state == 'preamble':
+                # 첫 delimiter 앞에는 CRLF가 없을 수 있음
+                first = self._delimiter[2:]
+                idx = self.buffer.find(first, self._pos, self.size)
+                if idx < 0:
+                    self._pos = max(self._pos, self.size - len(first) + 1)
+                    return
+                if not self._after_delimiter(idx + len(first)):
+                    return
+
+            elif self._state == 'headers':
+                idx = self.buffer.find(b'\r\n\r\n', self._pos, self.size)
+                if idx < 0:
+                    return
+                self._part_headers = self._parse_headers(bytes(self.buffer[self._pos:idx]))
+                self._part_start = self._pos = idx + 4
+                self._state = 'body'
+
+            elif self._state == 'body':
+                idx = self.buffer.find(self._delimiter, self._pos, self.size)
+                if idx < 0:
+                    # delimiter가 chunk 경계에 걸칠 수 있으므로 끝부분은 다시 검색
+                    self._pos = max(self._part_start, self.size - len(self._delimiter) + 1)
+                    return
+                if self.size < idx + len(self._delimiter) + 2:
+                    return
+                self._parts.append((self._part_headers, self._part_start, idx))
+                if not self._after_delimiter(idx + len(self._delimiter)):
+                    return
+            else:
+                return
+
+    def _after_delimiter(self, pos):
+        marker = bytes(self.buffer[pos:min(pos + 2, self.size)])
+        if len(marker) < 2:
+            return False
+        if marker == b'--':
+            self._state = 'done'
+        elif marker == b'\r\n':
+            self._state = 'headers'
+            self._pos = pos + 2
+        else:
+            raise ValueError("Malformed multipart body")
+        return True
+
+    @staticmethod
+    def _parse_headers(block):
+        headers = {}
+        for line in block.decode('latin-1').split('\r\n'):
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return headers
+
+    def close(self):
+        if not self.done:
+            raise ValueError("Incomplete multipart body")
+
+    def fields(self):
+        """Returns ``(files, form)``: field name -> ``UploadFile`` / str (first part per name)."""
+        view = memoryview(self.buffer)
+        files, form = {}, {}
+        for headers, start, end in self._parts:
+            _, params = _parse_header_params(headers.get('content-disposition', ''))
+            name = params.get('name')
+            if name is None:
+                continue
+            if 'filename' in params:
+                files.setdefault(name, UploadFile(view[start:end], params['filename'], headers.get('content-type')))
+            else:
+                form.setdefault(name, str(view[start:end], 'utf-8'))
+        return files, form
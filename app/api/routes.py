@@ -1,28 +1,103 @@
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from flask import Blueprint, jsonify, request
-from app.models import FaceModel, ArmModel, SpeechModel
+from app.api.multipart import RequestTooLargeError
+from app.metrics import REGISTRY, timed
+from app.models.cache import ResultCache, LRUCacheBackend
+from app.models.registry import ModelRegistry, ModelUnavailableError
+from app.preprocessing.executor import PreprocessExecutor
+from config import (BATCH_MAX_FILES, PREPROCESS_WORKERS, ASSESS_FUSION_WEIGHTS, ENABLED_MODALITIES, MODEL_LOADING,
+                    MAX_UPLOAD_BYTES, REQUEST_TIMEOUT_SECONDS, REQUEST_WORKER_THREADS, RESULT_CACHE_ENABLED, RESULT_CACHE_MAX_ENTRIES,
+                    RESULT_CACHE_TTL_SECONDS)
 
 api_bp = Blueprint('api', __name__)
 
-face_model = FaceModel()
-arm_model = ArmModel()
-speech_model = SpeechModel()
+# 워커 프로세스는 모델 로딩 전에 생성 (fork 시 TensorFlow 상태를 물려받지 않도록)
+preprocess_executor = None
+if PREPROCESS_WORKERS > 0:
+    preprocess_executor = PreprocessExecutor(PREPROCESS_WORKERS, modalities=ENABLED_MODALITIES)
+
+result_cache = None
+if RESULT_CACHE_ENABLED:
+    result_cache = ResultCache(LRUCacheBackend(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS))
+    REGISTRY.register_collector(lambda: [
+        '# TYPE stroke_result_cache_hits_total counter',
+        f'stroke_result_cache_hits_total {result_cache.hits}',
+        '# TYPE stroke_result_cache_misses_total counter',
+        f'stroke_result_cache_misses_total {result_cache.misses}',
+    ])
+
+model_registry = ModelRegistry(ENABLED_MODALITIES, MODEL_LOADING,
+                               executor=preprocess_executor, cache=result_cache)
+model_registry.start()
+
+# 전처리 + 추론은 이 pool에서 실행하고 요청 스레드는 deadline까지만 대기
+# (요청마다 스레드를 새로 만들지 않음, 스레드는 첫 submit 때 생성)
+request_executor = ThreadPoolExecutor(max_workers=REQUEST_WORKER_THREADS, thread_name_prefix='request')
+
+
+class RequestTimeoutError(TimeoutError):
+    """Preprocessing and inference did not finish within REQUEST_TIMEOUT_SECONDS."""
+
+
+def predict(modality, file):
+    return model_registry.get(modality).predict(file)
+
+
+def wait_for_result(future, deadline=None):
+    """``future.result()``, raising RequestTimeoutError once ``deadline`` (monotonic) passes.
+
+    A future that has not started by then is cancelled, so timed-out
+    requests do not keep occupying ``request_executor``.
+    """
+    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise RequestTimeoutError(
+            f"Request did not finish within {REQUEST_TIMEOUT_SECONDS:g} seconds") from None
+
+
+def request_deadline():
+    return time.monotonic() + REQUEST_TIMEOUT_SECONDS if REQUEST_TIMEOUT_SECONDS > 0 else None
+
+
+def run_with_deadline(func, *args):
+    # 대기 중인 작업은 시간 초과 시 취소, 이미 실행 중인 작업은 중단할 수 없으므로 끝까지 실행됨
+    return wait_for_result(request_executor.submit(func, *args), request_deadline())
+
+
+def model_unavailable(error):
+    return jsonify({"error": "Service Unavailable", "message": str(error)}), 503
+
+
+def request_timeout(error):
+    return jsonify({"error": "Gateway Timeout", "message": str(error)}), 504
+
 
 @api_bp.route('/face', methods=['POST'])
 def face_analysis():
     try: 
-        if 'image' not in request.files:
+        with timed('face', 'parse'):
+            files = request.files
+        if 'image' not in files:
             return jsonify({'error':"No image file"}), 400
         
-        image_file = request.files['image']
+        image_file = files['image']
 
         if image_file.filename == '':
             return jsonify({'error': 'No selected file'}), 400
 
         if image_file:
-            result = face_model.predict(image_file)
+            result = run_with_deadline(predict, 'face', image_file)
             return jsonify({"message": "Face analysis completed", "result":result}), 200
         
+    except ModelUnavailableError as e:
+        return model_unavailable(e)
+    except RequestTimeoutError as e:
+        return request_timeout(e)
     except Exception as e:
         return jsonify({
             "error": "Internal Server Error",
@@ -33,17 +108,23 @@ def face_analysis():
 @api_bp.route('/arm', methods=['POST'])
 def arm_analysis():
     try:
-        if 'csv' not in request.files:
+        with timed('arm', 'parse'):
+            files = request.files
+        if 'csv' not in files:
             return jsonify({'error': 'No CSV files'}), 400
         
-        csv_file = request.files['csv']
+        csv_file = files['csv']
 
         if csv_file.filename == '':
             return jsonify({'error': 'No selected file'}), 400
 
         if csv_file:
-            result = arm_model.predict(csv_file)
+            result = run_with_deadline(predict, 'arm', csv_file)
             return jsonify({"message": "Arm analysis completed", "result": result}), 200
+    except ModelUnavailableError as e:
+        return model_unavailable(e)
+    except RequestTimeoutError as e:
+        return request_timeout(e)
     except Exception as e:
         return jsonify({
             "error": "Internal Server Error",
@@ -54,9 +135,11 @@ def arm_analysis():
 @api_bp.route('/speech', methods=['POST'])
 def speech_analysis():
     try: 
-        if 'audio' not in request.files:
+        with timed('speech', 'parse'):
+            files = request.files
+        if 'audio' not in files:
             return jsonify({'error': "No Audio file"}), 400
-        audio_file = request.files['audio']
+        audio_file = files['audio']
 
         if audio_file.filename=='':
             return jsonify({'error':'No selected file'}), 400   
@@ -67,8 +150,148 @@ def speech_analysis():
             # result = speech_model.predict(temp_path)
 
             # 모델 직접 전달시
-            result = speech_model.predict(audio_file)
+            result = run_with_deadline(predict, 'speech', audio_file)
             return jsonify({"message": "Speech analysis completed", "result": result}), 200
+    except ModelUnavailableError as e:
+        return model_unavailable(e)
+    except RequestTimeoutError as e:
+        return request_timeout(e)
+    except Exception as e:
+        return jsonify({
+            "error": "Internal Server Error",
+            "message": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+# 스트리밍 요청 본문을 읽는 단위
+STREAM_READ_BYTES = 64 * 1024
+
+
+@api_bp.route('/speech/stream', methods=['POST'])
+def speech_stream_analysis():
+    try:
+        model = model_registry.get('speech')
+        # 본문(WAV)을 받는 동안 디코딩/리샘플링 진행
+        stream = model.open_stream()
+        while True:
+            chunk = request.stream.read(STREAM_READ_BYTES)
+            if not chunk:
+                break
+            # chunked 본문은 길이를 모르므로 받는 동안 크기 제한
+            if stream.bytes_received + len(chunk) > MAX_UPLOAD_BYTES:
+                raise RequestTooLargeError(f"Request body exceeds {MAX_UPLOAD_BYTES} bytes")
+            stream.feed(chunk)
+
+        if stream.bytes_received == 0:
+            return jsonify({'error': "No Audio file"}), 400
+
+        result = run_with_deadline(model.predict_stream, stream)
+        return jsonify({"message": "Speech analysis completed", "result": result}), 200
+    except RequestTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except ModelUnavailableError as e:
+        return model_unavailable(e)
+    except RequestTimeoutError as e:
+        return request_timeout(e)
+    except Exception as e:
+        return jsonify({
+            "error": "Internal Server Error",
+            "message": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+def batch_analysis(modality, field, missing_message, name):
+    try:
+        with timed(modality, 'parse'):
+            files = [file for file in request.files.getlist(field) if file.filename != '']
+        if not files:
+            return jsonify({'error': missing_message}), 400
+        if len(files) > BATCH_MAX_FILES:
+            return jsonify({'error': f'Too many files (max {BATCH_MAX_FILES})'}), 400
+
+        model = model_registry.get(modality)
+
+        # 파일별 오류는 해당 항목에만 기록하고 나머지 결과는 그대로 반환
+        results = []
+        for file, result in zip(files, run_with_deadline(model.predict_batch, files)):
+            if 'error' in result:
+                results.append({"filename": file.filename, "error": result['error']})
+            else:
+                results.append({"filename": file.filename, "result": result})
+
+        return jsonify({"message": f"{name} batch analysis completed", "results": results}), 200
+    except ModelUnavailableError as e:
+        return model_unavailable(e)
+    except RequestTimeoutError as e:
+        return request_timeout(e)
+    except Exception as e:
+        return jsonify({
+            "error": "Internal Server Error",
+            "message": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+@api_bp.route('/face/batch', methods=['POST'])
+def face_batch_analysis():
+    return batch_analysis('face', 'image', 'No image file', 'Face')
+
+
+@api_bp.route('/arm/batch', methods=['POST'])
+def arm_batch_analysis():
+    return batch_analysis('arm', 'csv', 'No CSV files', 'Arm')
+
+
+@api_bp.route('/speech/batch', methods=['POST'])
+def speech_batch_analysis():
+    return batch_analysis('speech', 'audio', 'No Audio file', 'Speech')
+
+
+def fuse_results(results):
+    # 성공한 modality 점수의 가중 평균
+    weights = {name: ASSESS_FUSION_WEIGHTS.get(name, 1.0) for name, result in results.items()
+               if 'error' not in result}
+    total = sum(weights.values())
+    if total <= 0:
+        return None
+
+    score = sum(results[name]['score'] * weight for name, weight in weights.items()) / total
+    return {"stroke": int(score > 0.5),
+            "score": float(score),
+            "modalities": sorted(weights)}
+
+
+@api_bp.route('/assess', methods=['POST'])
+def assess():
+    try:
+        with timed('assess', 'parse'):
+            files = request.files
+
+        tasks = {}
+        for name, field in [('face', 'image'), ('arm', 'csv'), ('speech', 'audio')]:
+            file = files.get(field)
+            if file is not None and file.filename != '':
+                tasks[name] = file
+
+        if not tasks:
+            return jsonify({'error': 'No image, CSV or audio file'}), 400
+
+        # modality별 전처리 + 추론을 동시에 실행
+        results = {}
+        deadline = request_deadline()
+        futures = {name: request_executor.submit(predict, name, file) for name, file in tasks.items()}
+        for name, future in futures.items():
+            try:
+                # 시간 초과된 modality는 (시작 전이면 취소하고) 오류로 기록하고 나머지 결과로 판정
+                results[name] = wait_for_result(future, deadline)
+            except Exception as e:
+                results[name] = {"error": str(e)}
+
+        return jsonify({"message": "Stroke assessment completed",
+                        "results": results,
+                        "fused": fuse_results(results)}), 200
     except Exception as e:
         return jsonify({
             "error": "Internal Server Error",
@@ -77,6 +300,19 @@ def speech_analysis():
         }), 500
 
 
+@api_bp.route('/ready', methods=['GET'])
+def readiness():
+    ready = model_registry.ready()
+    return jsonify({"ready": ready, "models": model_registry.status()}), 200 if ready else 503
+
+
+@api_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    if result_cache is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **result_cache.stats()}), 200
+
+
 @api_bp.errorhandler(400)
 def bad_request(error):
     return jsonify({"error": str(error.description)}), 400
@@ -1,5 +1,7 @@
-from flask import Flask
+import time
+from flask import Flask, Response, g, request
 from app.api.routes import api_bp
+from app.metrics import REGISTRY, request_latency
 
 
 def create_app():
@@ -9,8 +11,29 @@ def create_app():
     def home():
         return "Welcome to MedAI-Stroke API"
 
+    @app.route('/metrics')
+    def metrics():
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        if 'request_start' in g:
+            request_latency.observe(time.perf_counter() - g.request_start,
+                                    request.endpoint or 'unknown', response.status_code)
+        return response
+
     app.register_blueprint(api_bp, url_prefix='/api')
 
 
 
-    return app
\ No newline at end of file
+    return app
+
+
+def create_asgi_app():
+    # 업로드 endpoint는 ASGI로 직접 처리, 나머지는 Flask 앱으로 전달
+    from app.api.asgi import StrokeASGIApp
+    return StrokeASGIApp(wsgi_app=create_app())
\ No newline at end of file
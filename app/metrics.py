@@ -0,0 +1,89 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds (Prometheus "le" upper bounds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names."""
+
+    def __init__(self, name, documentation, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # bucket별 개수 + (+Inf), 합계
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+
+        for label_values, counts, total in series:
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collects histograms and extra collectors for the /metrics endpoint."""
+
+    def __init__(self):
+        self._histograms = []
+        self._collectors = []
+
+    def histogram(self, name, documentation, label_names, buckets=DEFAULT_BUCKETS):
+        histogram = Histogram(name, documentation, label_names, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_collector(self, collector):
+        """``collector()`` returns exposition-format lines, rendered after the histograms."""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+stage_latency = REGISTRY.histogram(
+    'stroke_stage_duration_seconds', 'Latency of request parsing, preprocessing steps and model inference.',
+    ['modality', 'stage'])
+
+request_latency = REGISTRY.histogram(
+    'stroke_request_duration_seconds', 'Latency of HTTP requests.', ['endpoint', 'status'])
+
+
+@contextmanager
+def timed(modality, stage):
+    """Records the duration of the ``with`` block as one stage observation."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_latency.observe(time.perf_counter() - start, modality, stage)
@@ -1,5 +1,16 @@
-from .arm_model import ArmModel
-from .face_model import FaceModel
-from .speech_model import SpeechModel
+import importlib
 
-__all__ = ['ArmModel', 'SpeechModel', 'FaceModel']
\ No newline at end of file
+# 모델 클래스는 처음 접근할 때 import (TensorFlow, dlib 등은 필요한 modality에서만 로드)
+_LAZY_ATTRIBUTES = {
+    'ArmModel': '.arm_model',
+    'FaceModel': '.face_model',
+    'SpeechModel': '.speech_model',
+}
+
+__all__ = ['ArmModel', 'SpeechModel', 'FaceModel']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class CompiledForest:
+    """RandomForestClassifier.predict_proba over flat NumPy node arrays.
+
+    The nodes of all trees are concatenated into contiguous feature /
+    threshold / child arrays. Leaves point to themselves, so every row walks
+    ``max_depth`` vectorized steps through all trees at once and stays put
+    once it reaches a leaf. Inputs are cast to float32 and the leaf
+    probabilities are summed tree by tree, as sklearn does, so the result is
+    bit-identical to ``predict_proba``.
+    """
+
+    def __init__(self, forest):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            # DecisionTreeClassifier.predict_proba: leaf value를 합이 1이 되도록 정규화
+            value = tree.value[:, 0, :]
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+            offset += tree.node_count
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.depth = max(estimator.tree_.max_depth for estimator in forest.estimators_)
+        self.classes_ = forest.classes_
+
+    def apply(self, X):
+        """(n_samples, n_features) -> (n_samples, n_trees) leaf node indices."""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        leaf_values = self.value[self.apply(X)]
+        # 트리 순서대로 누적 (sklearn과 같은 합산 순서)
+        return np.cumsum(leaf_values, axis=1)[:, -1] / len(self.roots)
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
@@ -1,21 +1,37 @@
 import os
 import pickle
+import numpy as np
 from app.preprocessing import preprocess_csv
+from app.preprocessing.csv_processing import arm_transform
+from app.models.arm_inference import CompiledForest
+from app.models.base import StrokeModel
+from app.models.cache import artifact_version
 
 from config import TRAINED_MODELS_DIR
 
-class ArmModel:
-    def __init__(self):
+class ArmModel(StrokeModel):
+    modality = 'arm'
+
+    def __init__(self, executor=None, cache=None):
+        super().__init__(executor, cache)
         model_path = os.path.join(TRAINED_MODELS_DIR, 'arm_model.pkl' )
         with open(model_path, 'rb') as file:
             self.model = pickle.load(file)
-        
-    def predict(self, csv_file):
-        df = preprocess_csv(csv_file)
-        pred_cls = self.model.predict(df)
-        pred_prob = self.model.predict_proba(df)[:,1][0]
-
-        return {"stroke": int(pred_cls),
-                "score": float(pred_prob)} 
+        self.version = artifact_version(model_path)
+        self.engine = CompiledForest(self.model)
+
+        # 표준화 + PCA 파라미터 (import 시 한 번만 로드)
+        self.transform = arm_transform
+
+    def _preprocess(self, csv_file):
+        return preprocess_csv(csv_file, self.transform)
+
+    def infer(self, df):
+        # predict()는 predict_proba()의 argmax이므로 한 번만 계산
+        probs = self.engine.predict_proba(np.asarray(df))
+        pred_cls = self.engine.classes_.take(probs.argmax(axis=1))
+
+        return [{"stroke": int(cls),
+                 "score": float(prob)} for cls, prob in zip(pred_cls, probs[:, 1])]
 
 
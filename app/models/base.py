@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+
+from app.metrics import timed
+from config import BATCH_PREPROCESS_WORKERS
+
+
+class StrokeModel:
+    """Shared single-file and batch prediction flow of the modality models.
+
+    Subclasses set ``modality``, implement ``_preprocess`` (one upload -> model
+    input with a leading batch axis of 1) and ``infer`` (stacked inputs -> one
+    result dict per row). With an ``executor`` the preprocessing runs in its
+    worker processes instead of the calling thread. With a ``cache``, repeated
+    uploads of the same bytes return the stored result without preprocessing
+    or inference; subclasses then set ``version`` to identify their weights.
+    """
+
+    modality = None
+    version = None
+
+    def __init__(self, executor=None, cache=None):
+        self.executor = executor
+        self.cache = cache
+        # 배치 요청마다 스레드를 새로 만들지 않도록 유지 (스레드는 첫 submit 때 생성)
+        self.batch_executor = ThreadPoolExecutor(max_workers=BATCH_PREPROCESS_WORKERS,
+                                                 thread_name_prefix=f'{self.modality}-batch')
+
+    def _preprocess(self, file):
+        raise NotImplementedError
+
+    def preprocess(self, file):
+        with timed(self.modality, 'preprocess'):
+            if self.executor is not None:
+                return self.executor.preprocess(self.modality, file)
+            return self._preprocess(file)
+
+    def _predict(self, file):
+        inputs = self.preprocess(file)
+        with timed(self.modality, 'inference'):
+            return self.infer(inputs)[0]
+
+    def predict(self, file):
+        if self.cache is None:
+            return self._predict(file)
+
+        data = file.read()
+        key = self.cache.make_key(self.modality, self.version, data)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._predict(BytesIO(data))
+            self.cache.set(key, result)
+        return result
+
+    def predict_batch(self, files):
+        """Preprocesses ``files`` in parallel and runs a single stacked inference.
+
+        Returns one entry per file, in order: the result dict, or
+        ``{"error": message}`` when that file could not be processed.
+        """
+        files = list(files)
+        results = [None] * len(files)
+        keys = [None] * len(files)
+        pending = list(range(len(files)))
+
+        if self.cache is not None:
+            pending = []
+            for idx, file in enumerate(files):
+                data = file.read()
+                keys[idx] = self.cache.make_key(self.modality, self.version, data)
+                results[idx] = self.cache.get(keys[idx])
+                if results[idx] is None:
+                    files[idx] = BytesIO(data)
+                    pending.append(idx)
+
+        inputs, indices = [], []
+        futures = [self.batch_executor.submit(self.preprocess, files[idx]) for idx in pending]
+        for idx, future in zip(pending, futures):
+            try:
+                inputs.append(future.result())
+                indices.append(idx)
+            except Exception as e:
+                results[idx] = {"error": str(e)}
+
+        if inputs:
+            with timed(self.modality, 'batch_inference'):
+                batch_results = self.infer(np.concatenate(inputs, axis=0))
+            for idx, result in zip(indices, batch_results):
+                results[idx] = result
+                if self.cache is not None:
+                    self.cache.set(keys[idx], result)
+        return results
@@ -0,0 +1,84 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Collects concurrent single-sample requests and runs them as one batch.
+
+    Callers submit one sample at a time (with a leading batch axis of 1). A
+    background thread waits up to ``max_wait_ms`` for more requests, stacks at
+    most ``max_batch_size`` samples along axis 0, calls ``infer_fn`` once and
+    hands every caller its own row of the output.
+    """
+
+    def __init__(self, infer_fn, max_batch_size=8, max_wait_ms=5.0, name='micro-batcher'):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, sample):
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+
+        future = Future()
+        self._queue.put((sample, future))
+        return future
+
+    def predict(self, sample):
+        return self.submit(sample).result()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch):
+        try:
+            inputs = np.concatenate([sample for sample, _ in batch], axis=0)
+            outputs = self.infer_fn(inputs)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for idx, (_, future) in enumerate(batch):
+            future.set_result(outputs[idx:idx + 1])
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def artifact_version(path):
+    """Short content hash of a model file (or every file of a model directory)."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        paths = [path]
+
+    for file_path in paths:
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class CacheBackend:
+    """Storage interface of the result cache.
+
+    ``get`` returns ``None`` on a miss. Implement these two methods to back the
+    cache with another store (e.g. a shared key-value service).
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def __len__(self):
+        return 0
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU store with a size bound and per-entry TTL."""
+
+    def __init__(self, max_entries=1024, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResultCache:
+    """Prediction results keyed by modality, model version and upload hash."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(modality, version, data):
+        return f'{modality}:{version}:{hashlib.sha256(data).hexdigest()}'
+
+    def get(self, key):
+        result = self.backend.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if result is None else dict(result)
+
+    def set(self, key, result):
+        self.backend.set(key, dict(result))
+
+    def stats(self):
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.backend)}
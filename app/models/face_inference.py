@@ -0,0 +1,38 @@
+import numpy as np
+from scipy.special import expit
+
+
+class FaceMLPInference:
+    """Face MLP forward pass with the feature scaling folded into its weights.
+
+    ``StandardScaler`` and ``MinMaxScaler`` are both affine (``x * a + b``), so
+    ``(x * a + b) @ W1 + b1 == x @ (a[:, None] * W1) + (b @ W1 + b1)``. The
+    network then runs on the raw distance ratios as plain NumPy matmuls,
+    without sklearn's per-call input validation.
+    """
+
+    def __init__(self, scaler, norm, model):
+        if model.activation != 'relu' or model.out_activation_ != 'logistic':
+            raise ValueError("Only relu MLPs with a logistic output can be folded")
+        if norm.clip:
+            raise ValueError("A clipping MinMaxScaler cannot be folded into the MLP")
+
+        scale = norm.scale_ / scaler.scale_
+        shift = norm.min_ - scaler.mean_ * scale
+
+        self.coefs = [np.array(coef, dtype=np.float64) for coef in model.coefs_]
+        self.intercepts = [np.array(intercept, dtype=np.float64) for intercept in model.intercepts_]
+        self.intercepts[0] = shift @ self.coefs[0] + self.intercepts[0]
+        self.coefs[0] = scale[:, np.newaxis] * self.coefs[0]
+
+    def __call__(self, features):
+        """(N, 4) unscaled features -> (N,) probability of class 1."""
+        hidden = np.asarray(features, dtype=np.float64)
+        for coef, intercept in zip(self.coefs[:-1], self.intercepts[:-1]):
+            hidden = hidden @ coef
+            hidden += intercept
+            np.maximum(hidden, 0, out=hidden)
+
+        output = hidden @ self.coefs[-1]
+        output += self.intercepts[-1]
+        return expit(output[:, 0])
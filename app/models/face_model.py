@@ -1,22 +1,35 @@
 import os
 import joblib
-from app.preprocessing import preprocess_image
+from app.preprocessing.image_processing import extract_face_features, norm, scaler
+from app.models.base import StrokeModel
+from app.models.cache import artifact_version
+from app.models.face_inference import FaceMLPInference
 from config import TRAINED_MODELS_DIR
 
 
-class FaceModel:
-    def __init__(self):
-        self.model = joblib.load(os.path.join(TRAINED_MODELS_DIR, 'face_model.pkl'))
+class FaceModel(StrokeModel):
+    modality = 'face'
 
-    def predict(self, image_file):
-        face_data = preprocess_image(image_file)
-        probs = self.model.predict_proba(face_data)[0]
-        fail_prob = probs[0]
-        pass_prob = probs[1]
+    def __init__(self, executor=None, cache=None):
+        super().__init__(executor, cache)
+        model_path = os.path.join(TRAINED_MODELS_DIR, 'face_model.pkl')
+        self.model = joblib.load(model_path)
+        self.version = artifact_version(model_path)
 
-        pred_cls = (pass_prob > fail_prob).astype(int)
-        
-        return {"stroke": int(pred_cls),
-                'score': float(pass_prob)}
+        # scaler/norm 변환을 MLP 첫 layer에 합친 forward pass
+        self.engine = FaceMLPInference(scaler, norm, self.model)
 
-    
\ No newline at end of file
+    def _preprocess(self, image_file):
+        return extract_face_features(image_file)
+
+    def infer(self, face_data):
+        results = []
+        for pass_prob in self.engine(face_data):
+            fail_prob = 1.0 - pass_prob
+
+            pred_cls = int(pass_prob > fail_prob)
+            results.append({"stroke": pred_cls,
+                            'score': float(pass_prob)})
+        return results
+
+    
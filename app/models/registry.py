@@ -0,0 +1,107 @@
+import importlib
+import threading
+
+# modality -> (module, class); a model's module is only imported when it loads
+MODEL_CLASSES = {
+    'face': ('app.models.face_model', 'FaceModel'),
+    'arm': ('app.models.arm_model', 'ArmModel'),
+    'speech': ('app.models.speech_model', 'SpeechModel'),
+}
+
+LOADING_MODES = ('eager', 'background', 'lazy')
+
+
+class ModelUnavailableError(RuntimeError):
+    """The requested modality is disabled in this process or failed to load."""
+
+
+class ModelRegistry:
+    """Loads the models of the enabled modalities and hands them to the routes.
+
+    ``mode`` selects when the models load: ``'eager'`` loads them concurrently
+    and returns from ``start`` once all are ready (re-raising the first
+    failure), ``'background'`` starts the same loader threads and returns
+    immediately, and ``'lazy'`` loads each model on its first ``get``.
+    ``get`` waits for a model that is still loading. Keyword arguments are
+    passed to every model constructor.
+    """
+
+    def __init__(self, modalities, mode='background', **model_kwargs):
+        unknown = set(modalities) - set(MODEL_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown modalities: {', '.join(sorted(unknown))}")
+        if mode not in LOADING_MODES:
+            raise ValueError(f"Unknown model loading mode: {mode}")
+
+        self.modalities = tuple(modalities)
+        self.mode = mode
+        self.model_kwargs = model_kwargs
+
+        self._models = {}
+        self._errors = {}
+        self._loading = set()
+        self._loaded = {modality: threading.Event() for modality in self.modalities}
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.mode == 'lazy':
+            return
+
+        threads = [threading.Thread(target=self._load, args=(modality,), name=f'load-{modality}-model',
+                                    daemon=True)
+                   for modality in self.modalities]
+        for thread in threads:
+            thread.start()
+
+        if self.mode == 'eager':
+            for thread in threads:
+                thread.join()
+            for modality in self.modalities:
+                if modality in self._errors:
+                    raise self._errors[modality]
+
+    def _load(self, modality):
+        with self._lock:
+            if modality in self._loading:
+                return
+            self._loading.add(modality)
+
+        try:
+            module, name = MODEL_CLASSES[modality]
+            model_class = getattr(importlib.import_module(module), name)
+            self._models[modality] = model_class(**self.model_kwargs)
+        except Exception as e:
+            self._errors[modality] = e
+        finally:
+            self._loaded[modality].set()
+
+    def get(self, modality):
+        if modality not in self._loaded:
+            raise ModelUnavailableError(f"The {modality} model is not enabled on this server")
+
+        if not self._loaded[modality].is_set():
+            # lazy 모드에서는 현재 스레드가 로드, 이미 로딩 중이면 완료까지 대기
+            self._load(modality)
+            self._loaded[modality].wait()
+
+        if modality in self._errors:
+            raise ModelUnavailableError(f"The {modality} model failed to load: {self._errors[modality]}")
+        return self._models[modality]
+
+    def status(self):
+        states = {}
+        for modality in self.modalities:
+            if modality in self._models:
+                states[modality] = 'ready'
+            elif modality in self._errors:
+                states[modality] = 'failed'
+            elif modality in self._loading:
+                states[modality] = 'loading'
+            else:
+                states[modality] = 'not_loaded'
+        return states
+
+    def ready(self):
+        """True when every enabled model is loaded (in lazy mode: none failed or is loading)."""
+        accepted = ('ready', 'not_loaded') if self.mode == 'lazy' else ('ready',)
+        return all(state in accepted for state in self.status().values())
@@ -0,0 +1,258 @@
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from config import TRAINED_MODELS_DIR
+
+# MFCC input of the speech CNN: (n_mfcc, n_frames); the batch axis stays dynamic
+INPUT_SHAPE = (13, 626)
+INPUT_SIGNATURE = [tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32, name='mfcc')]
+
+# float32: the Keras model as trained. float16 / int8: TFLite with float16
+# weights / int8 dynamic-range quantized weights (activations stay float)
+INFERENCE_MODES = ('float32', 'float16', 'int8')
+
+
+class KerasInference:
+    """Graph-mode forward pass of the Keras speech CNN.
+
+    The model is traced once into a ``tf.function`` with a fixed feature shape,
+    which skips the data adapter, callbacks and retracing that
+    ``keras.Model.predict`` goes through on every call.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._forward = tf.function(self._call, input_signature=INPUT_SIGNATURE)
+        self._forward.get_concrete_function()
+
+    def _call(self, mfcc):
+        return self.model(tf.expand_dims(mfcc, axis=-1), training=False)
+
+    def __call__(self, audio):
+        return self._forward(tf.convert_to_tensor(audio, dtype=tf.float32)).numpy()
+
+    def export(self, path, format='saved_model', quantization=None):
+        """Write the traced forward pass as a standalone SavedModel or TFLite file."""
+        if format == 'saved_model':
+            if quantization is not None:
+                raise ValueError("Quantization is only supported for the tflite format")
+            archive = keras.export.ExportArchive()
+            archive.track(self.model)
+            archive.add_endpoint('serve', self._call, input_signature=INPUT_SIGNATURE)
+            archive.write_out(path)
+        elif format == 'tflite':
+            with open(path, 'wb') as file:
+                file.write(self.to_tflite(quantization))
+        else:
+            raise ValueError(f"Unsupported export format: {format}")
+        return path
+
+    def to_tflite(self, quantization=None):
+        """TFLite flatbuffer of the forward pass.
+
+        ``quantization='float16'`` stores the weights as float16 and
+        ``'int8'`` applies dynamic-range quantization (int8 weights,
+        activations quantized on the fly). Both first fold the BatchNorm
+        layers into the neighbouring weights (see ``fold_batch_norm``).
+        """
+        if quantization not in (None, 'float16', 'int8'):
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        engine = self if quantization is None else KerasInference(fold_batch_norm(self.model))
+
+        # Keras 3 variables only convert cleanly through a SavedModel
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            saved_model_dir = engine.export(os.path.join(tmp_dir, 'saved_model'))
+            converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+            if quantization is not None:
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            if quantization == 'float16':
+                converter.target_spec.supported_types = [tf.float16]
+            return converter.convert()
+
+
+class SavedModelInference:
+    """Runs an exported SavedModel without rebuilding the Keras training graph."""
+
+    def __init__(self, path):
+        self.module = tf.saved_model.load(path)
+
+    def __call__(self, audio):
+        return self.module.serve(tf.convert_to_tensor(audio, dtype=tf.float32)).numpy()
+
+
+class TFLiteInference:
+    """Runs a TFLite flatbuffer (a file at ``path`` or ``model_content`` bytes).
+
+    Every batch size gets its own interpreter, created on first use, so the
+    micro-batcher's varying batch sizes never reallocate tensors. (Resizing
+    an allocated dynamic-range model also crashes the XNNPACK delegate.)
+    """
+
+    def __init__(self, path=None, num_threads=None, model_content=None):
+        self.path = path
+        self.model_content = model_content
+        self.num_threads = num_threads
+        self._interpreters = {}
+        # TFLite interpreter는 thread-safe 하지 않음
+        self._lock = threading.Lock()
+        self._interpreter(1)
+
+    def _interpreter(self, batch_size):
+        if batch_size not in self._interpreters:
+            interpreter = tf.lite.Interpreter(model_path=self.path, model_content=self.model_content,
+                                              num_threads=self.num_threads)
+            input_index = interpreter.get_input_details()[0]['index']
+            output_index = interpreter.get_output_details()[0]['index']
+            interpreter.resize_tensor_input(input_index, (batch_size,) + INPUT_SHAPE)
+            interpreter.allocate_tensors()
+            self._interpreters[batch_size] = (interpreter, input_index, output_index)
+        return self._interpreters[batch_size]
+
+    def __call__(self, audio):
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        with self._lock:
+            interpreter, input_index, output_index = self._interpreter(len(audio))
+            interpreter.set_tensor(input_index, audio)
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index).copy()
+
+
+def load_keras_model(path):
+    # The trained model contains Lambda layers
+    keras.config.enable_unsafe_deserialization()
+    return keras.models.load_model(path)
+
+
+def _inbound_layers(model):
+    """Layer name -> names of the layers feeding it, from the functional model config."""
+    inbound = {}
+    for layer in model.get_config()['layers']:
+        names = []
+        for node in layer['inbound_nodes']:
+            for arg in node['args']:
+                for tensor in arg if isinstance(arg, list) else [arg]:
+                    names.append(tensor['config']['keras_history'][0])
+        inbound[layer['name']] = names
+    return inbound
+
+
+def fold_batch_norm(model):
+    """Copy of the speech CNN with its BatchNormalization layers folded away.
+
+    Each BatchNorm follows Conv2D(relu) -> MaxPooling2D and feeds
+    GlobalAveragePooling2D -> Concatenate -> Dense. Its per-channel scale is
+    positive, so it commutes with the ReLU and the max pooling and is folded
+    into the convolution kernel and bias; its shift passes through the
+    average pooling and is folded into the Dense bias.
+    """
+    inbound = _inbound_layers(model)
+    consumers = {}
+    for name, sources in inbound.items():
+        for source in sources:
+            consumers.setdefault(source, []).append(name)
+
+    def single_consumer(name):
+        names = consumers.get(name, [])
+        if len(names) != 1:
+            raise ValueError(f"Cannot fold BatchNorm: {name} feeds {len(names)} layers")
+        return model.get_layer(names[0])
+
+    weights = {layer.name: layer.get_weights() for layer in model.layers}
+    shifts = {}
+    for layer in model.layers:
+        if not isinstance(layer, keras.layers.BatchNormalization):
+            continue
+        pool = model.get_layer(inbound[layer.name][0])
+        conv = model.get_layer(inbound[pool.name][0])
+        gap = single_consumer(layer.name)
+        if (not isinstance(pool, keras.layers.MaxPooling2D) or not isinstance(conv, keras.layers.Conv2D)
+                or conv.get_config()['activation'] not in ('relu', 'linear') or not conv.use_bias
+                or not isinstance(gap, keras.layers.GlobalAveragePooling2D)):
+            raise ValueError(f"Cannot fold BatchNorm {layer.name}: unsupported neighbouring layers")
+
+        gamma = np.ones(layer.moving_mean.shape) if layer.gamma is None else np.asarray(layer.gamma)
+        beta = np.zeros(layer.moving_mean.shape) if layer.beta is None else np.asarray(layer.beta)
+        scale = gamma / np.sqrt(np.asarray(layer.moving_variance) + layer.epsilon)
+        if np.any(scale <= 0):
+            raise ValueError(f"Cannot fold BatchNorm {layer.name}: non-positive scale")
+
+        kernel, bias = weights[conv.name]
+        weights[conv.name] = [kernel * scale, bias * scale]
+        shifts[gap.name] = beta - np.asarray(layer.moving_mean) * scale
+
+    for layer in model.layers:
+        if not isinstance(layer, keras.layers.Concatenate) or not set(inbound[layer.name]) & set(shifts):
+            continue
+        if not set(inbound[layer.name]) <= set(shifts):
+            raise ValueError(f"Cannot fold BatchNorm: {layer.name} mixes normalized and other inputs")
+        dense = single_consumer(layer.name)
+        while isinstance(dense, keras.layers.Dropout):
+            dense = single_consumer(dense.name)
+        if not isinstance(dense, keras.layers.Dense) or not dense.use_bias:
+            raise ValueError(f"Cannot fold BatchNorm: {layer.name} does not feed a Dense layer")
+        kernel, bias = weights[dense.name]
+        shift = np.concatenate([shifts.pop(name) for name in inbound[layer.name]])
+        weights[dense.name] = [kernel, bias + shift @ kernel]
+    if shifts:
+        raise ValueError(f"Cannot fold BatchNorm: {', '.join(shifts)} does not feed a Concatenate layer")
+
+    # 같은 그래프를 BatchNorm 없이 다시 구성
+    tensors = {}
+    for layer in model.layers:
+        sources = [tensors[name] for name in inbound[layer.name]]
+        if isinstance(layer, keras.layers.InputLayer):
+            tensors[layer.name] = keras.Input(batch_shape=layer.batch_shape, name=layer.name)
+        elif isinstance(layer, keras.layers.BatchNormalization):
+            tensors[layer.name] = sources[0]
+        else:
+            clone = layer.__class__.from_config(layer.get_config())
+            tensors[layer.name] = clone(sources if len(sources) > 1 else sources[0])
+            clone.set_weights(weights[layer.name])
+    return keras.Model(tensors[model.layers[0].name], tensors[model.layers[-1].name], name=model.name)
+
+
+def load_speech_inference(path, mode='float32'):
+    """Picks the inference engine from the artifact type at ``path``.
+
+    A reduced-precision ``mode`` ('float16' or 'int8') converts the ``.keras``
+    model to TFLite in memory at load time; a ``.tflite`` artifact runs as
+    it was exported.
+    """
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"Unknown speech inference mode: {mode}")
+    if path.endswith('.tflite'):
+        return TFLiteInference(path)
+    if os.path.isdir(path):
+        if mode != 'float32':
+            raise ValueError("A SavedModel artifact runs in float32; export a quantized .tflite file instead")
+        return SavedModelInference(path)
+    engine = KerasInference(load_keras_model(path))
+    if mode == 'float32':
+        return engine
+    return TFLiteInference(model_content=engine.to_tflite(quantization=mode))
+
+
+def export_speech_model(path, format='saved_model', quantization=None,
+                        model_path=os.path.join(TRAINED_MODELS_DIR, 'speech_model.keras')):
+    engine = KerasInference(load_keras_model(model_path))
+    if format == 'saved_model' and os.path.isdir(path):
+        shutil.rmtree(path)
+    return engine.export(path, format=format, quantization=quantization)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export the speech CNN for inference")
+    parser.add_argument('output', help="Output directory (saved_model) or .tflite file")
+    parser.add_argument('--format', choices=['saved_model', 'tflite'], default='saved_model')
+    parser.add_argument('--quantization', choices=['float16', 'int8'], default=None,
+                        help="Reduced-precision weights (tflite only)")
+    args = parser.parse_args()
+
+    print(f"Exported to {export_speech_model(args.output, args.format, args.quantization)}")
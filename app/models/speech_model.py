@@ -1,20 +1,67 @@
-import os
-from tensorflow import keras
-from app.preprocessing import preprocess_audio
-from config import TRAINED_MODELS_DIR
+from app.metrics import timed
+from app.preprocessing import SpeechStream, preprocess_audio
+from app.models.base import StrokeModel
+from app.models.batching import MicroBatcher
+from app.models.cache import artifact_version
+from app.models.speech_inference import load_speech_inference
+from config import SPEECH_MODEL_PATH, SPEECH_BATCH_MAX_SIZE, SPEECH_BATCH_MAX_WAIT_MS, SPEECH_INFERENCE_MODE
 
 
-class SpeechModel:
-    def __init__(self):
-        keras.config.enable_unsafe_deserialization()
-        self.model = keras.models.load_model(os.path.join(TRAINED_MODELS_DIR, 'speech_model.keras')                                          )
-    
-    def predict(self, audio_file):
-        audio = preprocess_audio(audio_file)
-        pred_prob = self.model.predict(audio).flatten()
+class SpeechModel(StrokeModel):
+    modality = 'speech'
+
+    def __init__(self, model_path=SPEECH_MODEL_PATH, batch_max_size=SPEECH_BATCH_MAX_SIZE,
+                 batch_max_wait_ms=SPEECH_BATCH_MAX_WAIT_MS, inference_mode=SPEECH_INFERENCE_MODE,
+                 executor=None, cache=None):
+        super().__init__(executor, cache)
+        # Traced once here so requests never go through keras.Model.predict
+        self.engine = load_speech_inference(model_path, inference_mode)
+        self.version = artifact_version(model_path)
+        if inference_mode != 'float32':
+            # 정밀도별로 점수가 다르므로 캐시 키 분리
+            self.version = f'{self.version}-{inference_mode}'
+
+        # 동시 요청을 하나의 배치로 묶어 추론
+        self.batcher = None
+        if batch_max_size > 1:
+            self.batcher = MicroBatcher(self._infer, batch_max_size, batch_max_wait_ms,
+                                        name='speech-batcher')
+
+    def _infer(self, audio):
+        return self.engine(audio)
+
+    def _preprocess(self, audio_file):
+        return preprocess_audio(audio_file)
+
+    def infer(self, audio):
+        return self._to_results(self._infer(audio))
+
+    def _predict(self, audio_file):
+        return self._predict_features(self.preprocess(audio_file))
+
+    def _predict_features(self, audio):
+        with timed(self.modality, 'inference'):
+            if self.batcher is not None:
+                return self._to_results(self.batcher.predict(audio))[0]
+            return self.infer(audio)[0]
+
+    def open_stream(self):
+        return SpeechStream()
+
+    def predict_stream(self, stream):
+        """Result for a ``SpeechStream`` that has been fed the whole recording.
+
+        Streams bypass the result cache and the preprocessing workers: most
+        of their preprocessing already ran while the audio arrived.
+        """
+        with timed(self.modality, 'preprocess'):
+            audio = stream.finish()
+        return self._predict_features(audio)
+
+    def _to_results(self, outputs):
+        pred_prob = outputs.flatten()
         pred_cls = (pred_prob > 0.5).astype(int)
         
-        return {"stroke": int(pred_cls[0]),
-                "score": float(pred_prob[0])} 
+        return [{"stroke": int(cls),
+                 "score": float(prob)} for cls, prob in zip(pred_cls, pred_prob)]
     
-    
\ No newline at end of file
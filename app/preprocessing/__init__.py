@@ -1,5 +1,17 @@
-from .audio_processing import preprocess_audio
-from .csv_processing import preprocess_csv
-from .image_processing import preprocess_image
+import importlib
 
-__all__ = ['preprocess_csv', 'preprocess_audio', 'preprocess_image']
\ No newline at end of file
+# 전처리 모듈은 처음 접근할 때 import (dlib, librosa 등은 필요한 modality에서만 로드)
+_LAZY_ATTRIBUTES = {
+    'preprocess_csv': '.csv_processing',
+    'preprocess_audio': '.audio_processing',
+    'preprocess_image': '.image_processing',
+    'SpeechStream': '.audio_processing',
+}
+
+__all__ = ['preprocess_csv', 'preprocess_audio', 'preprocess_image', 'SpeechStream']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
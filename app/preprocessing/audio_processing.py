@@ -1,20 +1,165 @@
 import os
+import struct
+import threading
 from io import BytesIO
 import numpy as np
 import librosa
+import scipy.fft
+import scipy.signal
+import soxr
+from app.metrics import timed
 from config import PREPROCESSING_PARAMS_DIR
 
 
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _decode_wav_samples(data, format_tag, bits):
+    """Little-endian WAV sample bytes -> float32 with libsndfile's scaling."""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        if bits == 32:
+            return np.frombuffer(data, dtype='<f4')
+        if bits == 64:
+            return np.frombuffer(data, dtype='<f8').astype(np.float32)
+    elif format_tag == WAVE_FORMAT_PCM:
+        if bits == 8:
+            samples = np.frombuffer(data, dtype=np.uint8).astype(np.float32)
+            return (samples - 128) * np.float32(2 ** -7)
+        if bits == 16:
+            return np.frombuffer(data, dtype='<i2') * np.float32(2 ** -15)
+        if bits == 24:
+            # 3바이트 샘플을 int32 상위 24비트로 옮김
+            packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            samples = np.zeros((len(packed), 4), dtype=np.uint8)
+            samples[:, 1:] = packed
+            return samples.view('<i4').ravel().astype(np.float32) * np.float32(2 ** -31)
+        if bits == 32:
+            return np.frombuffer(data, dtype='<i4').astype(np.float32) * np.float32(2 ** -31)
+    return None
+
+
+def parse_wav_header(data):
+    """Sample format of the WAV file starting at ``data`` and where its samples start.
+
+    Returns ``(format_tag, channels, sr, block_align, bits, data_start,
+    data_size)`` once ``data`` reaches the header of the ``data`` chunk, or
+    ``None`` when it is not a WAV file this reader handles (or the header is
+    not complete yet).
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return None
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack_from('<I', data, pos + 4)[0]
+        body = pos + 8
+
+        if chunk_id == b'fmt ':
+            if size < 16 or len(data) < body + min(size, 40):
+                return None
+            format_tag, channels, sr, _, block_align, bits = struct.unpack_from('<HHIIHH', data, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                if size < 40:
+                    return None
+                # SubFormat GUID의 앞 2바이트가 실제 format tag
+                format_tag = struct.unpack_from('<H', data, body + 24)[0]
+            fmt = format_tag, channels, sr, block_align, bits
+
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            format_tag, channels, sr, block_align, bits = fmt
+            if channels == 0 or sr == 0 or block_align != channels * bits // 8:
+                return None
+            return format_tag, channels, sr, block_align, bits, body, size
+
+        pos = body + size + (size & 1)
+    return None
+
+
+def read_wav(data):
+    """Decodes a PCM or IEEE float WAV file held in ``data`` (bytes).
+
+    Samples are read straight from the upload buffer (a zero-copy view for
+    32-bit float) and averaged to mono like ``librosa.load``. Returns
+    ``(audio, sr)``, or ``None`` when ``data`` is not a WAV file this reader
+    handles.
+    """
+    header = parse_wav_header(data)
+    if header is None:
+        return None
+    format_tag, channels, sr, block_align, bits, body, size = header
+
+    # 잘린 업로드는 온전한 프레임까지만 사용
+    end = min(body + size, len(data))
+    end -= (end - body) % block_align
+    samples = _decode_wav_samples(memoryview(data)[body:end], format_tag, bits)
+    if samples is None:
+        return None
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sr
+
+
+def load_audio(audio_bytes):
+    """``librosa.load(..., sr=None)`` with a fast path for PCM/float WAV uploads."""
+    decoded = read_wav(audio_bytes)
+    if decoded is None:
+        decoded = librosa.load(BytesIO(audio_bytes), sr=None)
+    return decoded
+
+
+def resample(audio, sr, target_sr=16000):
+    if sr == target_sr:
+        return audio
+    return librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+
+
 def rms_normalize(audio, target_dB=-20):
     rms = np.sqrt(np.mean(audio**2))
     target_rms = 10**(target_dB/20)
     return audio * (target_rms/rms)
 
 
-def adaptive_preemphasis(audio, sr):
-    spec = np.abs(librosa.stft(audio))
-    freq_ratio = np.mean(spec[spec.shape[0]//2:]) / np.mean(spec[:spec.shape[0]//2])
-    
+def band_energy_ratio(audio, n_fft=2048, hop_length=1024):
+    """Mean high-band / low-band STFT magnitude of ``audio``.
+
+    Estimates the ratio of ``np.abs(librosa.stft(audio))`` without building the
+    full spectrogram: frames are taken at half-window hops (the Hann window is
+    still COLA there, so every sample keeps equal weight) and transformed with
+    a single-precision real FFT. ``hop_length=512`` uses the same frames as
+    ``librosa.stft`` and gives the full-STFT ratio.
+    """
+    window = scipy.signal.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+    padded = np.pad(np.asarray(audio, dtype=np.float32), n_fft // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop_length]
+    spec = np.abs(scipy.fft.rfft(frames * window, axis=-1))
+
+    half = spec.shape[1] // 2
+    return spec[:, half:].mean(dtype=np.float64) / spec[:, :half].mean(dtype=np.float64)
+
+
+# hop 1024 추정치의 오차에는 상한이 없으므로(프레임 사이의 짧은 잡음 등),
+# alpha 경계에서 이 상대 거리 안이면 librosa.stft와 같은 hop 512로 다시 계산
+PREEMPHASIS_EXACT_MARGIN = 0.25
+
+
+def alpha_boundary_distance(freq_ratio):
+    """Relative distance of ``freq_ratio`` to the nearest pre-emphasis alpha boundary."""
+    return min(abs(freq_ratio - bound) / bound for bound in (0.1, 0.3))
+
+
+def adaptive_preemphasis(audio, sr, freq_ratio=None):
+    # freq_ratio: band_energy_ratio(audio)를 이미 알고 있으면 재사용
+    if freq_ratio is None:
+        freq_ratio = band_energy_ratio(audio)
+    if alpha_boundary_distance(freq_ratio) <= PREEMPHASIS_EXACT_MARGIN:
+        freq_ratio = band_energy_ratio(audio, hop_length=512)
+
     if freq_ratio < 0.1:
         alpha = 0.97
     elif freq_ratio < 0.3:
@@ -25,34 +170,163 @@ def adaptive_preemphasis(audio, sr):
     return np.append(audio[0], audio[1:] - alpha * audio[:-1]), alpha
 
 
-def preprocess_audio(audio_file):
-    audio_bytes = audio_file.read()
+def nonsilent_intervals(y, top_db=60, frame_length=2048, hop_length=512, amin=1e-5):
+    """``librosa.effects.split`` for a mono signal, returning the same intervals.
 
-    # 1. Load audio
-    y, sr = librosa.load(BytesIO(audio_bytes), sr=None)
-    
-    # 2. Standardization of Sampling Rate
-    y = librosa.resample(y, orig_sr=sr, target_sr=16000)
+    librosa squares each of the overlapping frames separately with
+    ``np.power``, i.e. every sample ``frame_length / hop_length`` times. Here
+    the frame RMS is estimated from one pass of ``np.square``, and only the
+    frames too close to the loudest frame or to the ``top_db`` threshold for
+    that estimate to decide are recomputed with librosa's arithmetic.
+    """
+    y = np.asarray(y)
+    pad = frame_length // 2
+    windows = np.lib.stride_tricks.sliding_window_view(np.pad(np.square(y), pad), frame_length)
+    rms = np.sqrt(np.mean(windows[::hop_length], axis=-1))
+
+    # np.power와 제곱의 차이는 1 ulp 수준이므로 상대 오차 1e-4 밖의 프레임은 판정이 같음
+    tolerance = 1e-4
+    level = np.maximum(rms, amin)
+    threshold = level.max() * 10.0 ** (-top_db / 20)
+    uncertain = np.flatnonzero((level >= level.max() * (1 - tolerance)) |
+                               (np.abs(level - threshold) <= tolerance * threshold))
+    if len(uncertain):
+        padded = np.pad(y, pad)
+        frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[uncertain * hop_length]
+        rms[uncertain] = np.sqrt(np.mean(np.power(frames, 2, dtype=np.float32), axis=-1))
+
+    ref = rms[uncertain[np.argmax(rms[uncertain])]] if len(uncertain) else rms.max()
+    non_silent = librosa.amplitude_to_db(rms, ref=ref, amin=amin, top_db=None) > -top_db
+
+    # librosa.effects.split와 같은 구간 변환
+    edges = [np.flatnonzero(np.diff(non_silent.astype(int))) + 1]
+    if non_silent[0]:
+        edges.insert(0, np.array([0]))
+    if non_silent[-1]:
+        edges.append(np.array([len(non_silent)]))
+    edges = np.minimum(librosa.frames_to_samples(np.concatenate(edges), hop_length=hop_length), len(y))
+    return edges.reshape((-1, 2))
+
+
+class MFCCExtractor:
+    """MFCC front end for fixed-length clips, equivalent to ``librosa.feature.mfcc``.
+
+    The Hann window, mel basis and DCT-II matrix are built once, and the
+    centered (zero-padded) signal and windowed frames live in per-thread
+    buffers that are reused between calls. A call takes one clip of
+    ``n_samples`` or a ``(batch, n_samples)`` stack and returns
+    ``(n_mfcc, n_frames)`` or ``(batch, n_mfcc, n_frames)``; like a single
+    librosa call, the 80 dB floor is taken per clip.
+    """
+
+    def __init__(self, sr=16000, n_samples=320000, n_mfcc=13, n_fft=2048, hop_length=512,
+                 n_mels=128, top_db=80.0, amin=1e-10):
+        self.n_samples = n_samples
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_frames = 1 + n_samples // hop_length
+        self.top_db = top_db
+        self.amin = np.float32(amin)
+
+        self.window = scipy.signal.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+        # (n_fft//2 + 1, n_mels), (n_mels, n_mfcc): 프레임 축을 앞에 두고 matmul
+        self.mel_basis = np.ascontiguousarray(librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).T)
+        self.dct_basis = np.ascontiguousarray(
+            scipy.fft.dct(np.eye(n_mels), type=2, norm='ortho', axis=0)[:n_mfcc].T.astype(np.float32))
+
+        self._buffers = threading.local()
 
+    def _get_buffers(self, batch_size):
+        buffers = self._buffers
+        if getattr(buffers, 'batch_size', None) != batch_size:
+            # center=True 패딩 영역은 항상 0으로 유지
+            buffers.padded = np.zeros((batch_size, self.n_samples + self.n_fft), dtype=np.float32)
+            buffers.frames = np.empty((batch_size, self.n_frames, self.n_fft), dtype=np.float32)
+            buffers.batch_size = batch_size
+        return buffers.padded, buffers.frames
+
+    # BLAS switches to a different (differently rounded) kernel for very short
+    # matrices, so the active frame count is rounded up to a multiple of this
+    frame_block = 16
+
+    def active_frames(self, length):
+        """Leading frames to compute: those whose window overlaps the first ``length`` samples."""
+        n_active = -(-(length + self.n_fft // 2) // self.hop_length)
+        return min(self.n_frames, -(-n_active // self.frame_block) * self.frame_block)
+
+    def __call__(self, y, length=None):
+        """``length``: samples of real signal per clip; everything after it must be zero.
+
+        Frames that lie entirely in that zero tail have zero power, so their
+        log-mel column is the ``amin`` floor and the STFT and mel projection
+        are only computed for the frames before it.
+        """
+        y = np.asarray(y, dtype=np.float32)
+        single = y.ndim == 1
+        if single:
+            y = y[np.newaxis]
+        if y.shape[1] != self.n_samples:
+            raise ValueError(f"Expected clips of {self.n_samples} samples, got {y.shape[1]}")
+        n_active = self.n_frames if length is None else self.active_frames(int(np.max(length)))
+
+        padded, frames = self._get_buffers(len(y))
+        pad = self.n_fft // 2
+        padded[:, pad:pad + self.n_samples] = y
+        strided = np.lib.stride_tricks.sliding_window_view(padded, self.n_fft, axis=-1)[:, ::self.hop_length]
+        np.multiply(strided[:, :n_active], self.window, out=frames[:, :n_active])
+
+        # Power spectrum -> mel -> dB (ref=1.0, per-clip top_db floor) -> DCT
+        stft = scipy.fft.rfft(frames[:, :n_active], axis=-1)
+        power = np.square(stft.real)
+        power += np.square(stft.imag)
+        log_mel = np.empty((len(y), self.n_frames, self.mel_basis.shape[1]), dtype=np.float32)
+        np.maximum(power @ self.mel_basis, self.amin, out=log_mel[:, :n_active])
+        log_mel[:, n_active:] = self.amin
+        log_mel = np.log10(log_mel, out=log_mel)
+        log_mel *= 10.0
+        floor = log_mel.max(axis=(1, 2), keepdims=True) - self.top_db
+        np.maximum(log_mel, floor, out=log_mel)
+
+        mfcc = np.ascontiguousarray(np.swapaxes(log_mel @ self.dct_basis, 1, 2))
+        return mfcc[0] if single else mfcc
+
+
+mfcc_extractor = MFCCExtractor()
+
+
+def speech_features(y, freq_ratio=None, split=librosa.effects.split):
+    """Model input for 16 kHz audio ``y``: steps 3-8 of ``preprocess_audio``.
+
+    ``freq_ratio`` is ``band_energy_ratio(y)`` when the caller already has
+    it; the ratio does not depend on the volume, so it may come from ``y``
+    before normalization. ``split`` finds the non-silent intervals; it must
+    return the same intervals as ``librosa.effects.split``.
+    """
     # 3. Volume Normalization
-    y = rms_normalize(y)
+    with timed('speech', 'rms_normalize'):
+        y = rms_normalize(y)
 
     # 4. Pre-emphasis
-    y, _ = adaptive_preemphasis(y, sr=16000)
+    with timed('speech', 'preemphasis'):
+        y, _ = adaptive_preemphasis(y, sr=16000, freq_ratio=freq_ratio)
 
     # 5. 묵음 제거
-    intervals = librosa.effects.split(y, top_db=20)
-    y = np.concatenate([y[start:end] for start, end in intervals])
+    with timed('speech', 'split'):
+        intervals = split(y, top_db=20)
+        y = np.concatenate([y[start:end] for start, end in intervals])
 
     # 6. 오디오 길이 표준화
     target_length = 320000 # 20초 * 16000 sr
+    signal_length = min(len(y), target_length)
     if len(y) < target_length : 
         y = np.pad(y, (0, target_length - len(y)), mode='constant')
     else:
         y = y[:target_length]
 
      # 7. MFCC 추출
-    mfcc = librosa.feature.mfcc(y=y, sr=16000, n_mfcc=13, hop_length= 512)
+    with timed('speech', 'mfcc'):
+        # 패딩 구간 프레임은 계산하지 않음
+        mfcc = mfcc_extractor(y, length=signal_length)
     
     # 8. MFCC 정규화
     mfcc = (mfcc - np.mean(mfcc, axis=1, keepdims=True)) / \
@@ -61,3 +335,172 @@ def preprocess_audio(audio_file):
     
     # (20, 236) -> (1, 20, 236)
     return np.expand_dims(mfcc, axis=0)
+
+
+def preprocess_audio(audio_file):
+    audio_bytes = audio_file.read()
+
+    # 1. Load audio
+    with timed('speech', 'load'):
+        y, sr = load_audio(audio_bytes)
+    
+    # 2. Standardization of Sampling Rate
+    with timed('speech', 'resample'):
+        y = resample(y, sr)
+
+    return speech_features(y)
+
+
+class SpeechStream:
+    """Speech preprocessing for a WAV recording that arrives in chunks.
+
+    Each ``feed`` decodes the complete sample frames received so far,
+    resamples them to 16 kHz with a streaming soxr resampler (the same output
+    as ``resample`` on the whole signal) and accumulates the band energies
+    that choose the pre-emphasis. Volume normalization, silence removal and
+    the MFCCs depend on the whole recording, so ``finish`` runs them; it
+    returns exactly what ``preprocess_audio`` returns for the complete file.
+    Streams that are not PCM/float WAV are buffered and decoded by
+    ``finish``.
+    """
+
+    target_sr = 16000
+    # band_energy_ratio와 같은 프레임
+    n_fft = 2048
+    hop_length = 1024
+
+    def __init__(self):
+        self.bytes_received = 0
+        self._header = bytearray()
+        self._format = None
+        self._fallback = False
+        self._pending = b''
+        self._data_remaining = None
+
+        self._resampler = None
+        self._samples_in = 0
+
+        # 16 kHz 신호 앞에 band_energy_ratio의 center 패딩을 둠
+        self._pad = self.n_fft // 2
+        self._audio = np.zeros(self._pad + 20 * self.target_sr, dtype=np.float32)
+        self._length = 0
+
+        self._window = scipy.signal.get_window('hann', self.n_fft, fftbins=True).astype(np.float32)
+        self._frames_done = 0
+        self._high_sum = 0.0
+        self._low_sum = 0.0
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.bytes_received += len(chunk)
+        if self._fallback:
+            self._header += chunk
+            return
+
+        if self._format is None:
+            self._header += chunk
+            header = parse_wav_header(self._header)
+            if header is None:
+                if len(self._header) >= 12 and (self._header[:4] != b'RIFF' or self._header[8:12] != b'WAVE'):
+                    self._fallback = True
+                return
+            format_tag, channels, sr, block_align, bits, data_start, data_size = header
+            if _decode_wav_samples(b'', format_tag, bits) is None:
+                self._fallback = True
+                return
+            self._format = format_tag, channels, sr, block_align, bits
+            # 녹음 중에는 data 크기를 모르므로 0 / 0xFFFFFFFF로 기록됨
+            if data_size not in (0, 0xFFFFFFFF):
+                self._data_remaining = data_size
+            if sr != self.target_sr:
+                self._resampler = soxr.ResampleStream(sr, self.target_sr, 1, dtype='float32', quality='HQ')
+            chunk = bytes(self._header[data_start:])
+
+        self._decode(chunk)
+
+    def _decode(self, chunk):
+        if self._data_remaining is not None:
+            chunk = chunk[:self._data_remaining]
+            self._data_remaining -= len(chunk)
+
+        format_tag, channels, _, block_align, bits = self._format
+        data = self._pending + chunk if self._pending else chunk
+        end = len(data) - len(data) % block_align
+        self._pending = bytes(data[end:])
+        if end == 0:
+            return
+
+        samples = _decode_wav_samples(memoryview(data)[:end], format_tag, bits)
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        self._samples_in += len(samples)
+        if self._resampler is not None:
+            samples = self._resampler.resample_chunk(samples)
+        self._append(samples)
+
+    def _append(self, samples):
+        end = self._pad + self._length + len(samples)
+        if end + self._pad > len(self._audio):
+            grown = np.zeros(max(end + self._pad, 2 * len(self._audio)), dtype=np.float32)
+            grown[:self._pad + self._length] = self._audio[:self._pad + self._length]
+            self._audio = grown
+        self._audio[self._pad + self._length:end] = samples
+        self._length += len(samples)
+        self._accumulate_band_energy(self._pad + self._length)
+
+    def _accumulate_band_energy(self, available):
+        # available까지의 샘플로 완성된 프레임만 처리
+        n_frames = (available - self.n_fft) // self.hop_length + 1
+        if n_frames <= self._frames_done:
+            return
+        start = self._frames_done * self.hop_length
+        segment = self._audio[start:(n_frames - 1) * self.hop_length + self.n_fft]
+        frames = np.lib.stride_tricks.sliding_window_view(segment, self.n_fft)[::self.hop_length]
+        spec = np.abs(scipy.fft.rfft(frames * self._window, axis=-1))
+
+        half = spec.shape[1] // 2
+        self._high_sum += spec[:, half:].sum(dtype=np.float64)
+        self._low_sum += spec[:, :half].sum(dtype=np.float64)
+        self._frames_done = n_frames
+
+    def _band_energy_ratio(self):
+        n_bins = self.n_fft // 2 + 1
+        return (self._high_sum / (n_bins - n_bins // 2)) / (self._low_sum / (n_bins // 2))
+
+    def finish(self):
+        """Model input for the whole recording, shape (1, 13, 626)."""
+        if self._fallback or self._format is None:
+            if not self._header:
+                raise ValueError("No audio data received")
+            with timed('speech', 'load'):
+                y, sr = load_audio(bytes(self._header))
+            with timed('speech', 'resample'):
+                y = resample(y, sr)
+            return speech_features(y, split=nonsilent_intervals)
+
+        if self._resampler is not None:
+            with timed('speech', 'resample'):
+                self._append(self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+        if self._samples_in == 0:
+            raise ValueError("No audio data received")
+
+        # librosa.resample와 같은 길이로 맞춤
+        sr = self._format[2]
+        n_samples = int(np.ceil(self._samples_in * (float(self.target_sr) / sr)))
+        if self._length < n_samples:
+            self._append(np.zeros(n_samples - self._length, dtype=np.float32))
+        freq_ratio = None
+        if self._length == n_samples:
+            # 마지막 프레임들은 뒤쪽 center 패딩(0)까지 포함
+            self._accumulate_band_energy(self._pad + self._length + self._pad)
+            freq_ratio = self._band_energy_ratio()
+            # 경계 근처(PREEMPHASIS_EXACT_MARGIN 안)는 adaptive_preemphasis가 정규화된 신호로 정확히 다시 계산.
+            # 그 margin의 끝에서는 정규화된 신호로 추정치를 다시 구해 반올림 차이로 판정이 바뀌지 않도록 함
+            if abs(alpha_boundary_distance(freq_ratio) - PREEMPHASIS_EXACT_MARGIN) <= 1e-4:
+                freq_ratio = None
+        self._length = min(self._length, n_samples)
+
+        # 스트림 종료 후 지연을 줄이기 위해 빠른 묵음 구간 탐색 사용
+        return speech_features(self._audio[self._pad:self._pad + self._length], freq_ratio,
+                               split=nonsilent_intervals)
@@ -1,7 +1,8 @@
 import os
-from io import StringIO
+from io import BytesIO
 import numpy as np
 import pandas as pd
+from app.metrics import timed
 from config import PREPROCESSING_PARAMS_DIR
 
 
@@ -41,33 +42,257 @@ def extract(data: list, variable):
     return {f'{var_name}_{key}': round(float(value), 5) for key, value in features.items()}
 
 
+AXIS_NAMES = ['AccX', 'AccY', 'AccZ', 'GyrX', 'GyrY', 'GyrZ']
+STAT_NAMES = ['mean', 'std', 'max', 'min', 'mcr', 'peak', 'rms', 'grad', 'grad_1000']
+
+
+def extract_all(signals):
+    """Vectorized ``extract`` for all axes at once.
+
+    ``signals`` is a (n_axes, n_samples) float array, one row per axis in
+    ``AXIS_NAMES`` order. Returns the same dictionary as merging ``extract`` over
+    every row, value for value after rounding.
+    """
+    signals = np.ascontiguousarray(signals, dtype=np.float64)
+    n = signals.shape[1]
+
+    # cumsum keeps the left-to-right summation order of the built-in sum()
+    mean = np.cumsum(signals, axis=1)[:, -1] / n
+    std = np.std(signals, axis=1)
+    maximum = signals.max(axis=1)
+    minimum = signals.min(axis=1)
+
+    diff = np.diff(signals, axis=1)
+    abs_mcr = np.abs(diff).max(axis=1)
+    num_peak = ((diff[:, :-1] > 0) & (signals[:, 1:-1] > signals[:, 2:])).sum(axis=1)
+
+    mean_square = np.cumsum(signals * signals, axis=1)[:, -1] / n
+
+    # 최소제곱 직선의 기울기 (np.polyfit 1차와 동일)
+    x = np.arange(1, n + 1, dtype=np.float64)
+    x -= x.mean()
+    grad = (signals - mean[:, None]) @ x / (x @ x) * 20
+
+    grad_1000 = (np.abs(signals[:, 20:] - signals[:, :-20]) / 20).max(axis=1)
+
+    features = {}
+    for axis in range(len(signals)):
+        values = [mean[axis], std[axis], maximum[axis], minimum[axis], abs_mcr[axis],
+                  num_peak[axis], float(mean_square[axis]) ** 0.5, grad[axis], grad_1000[axis]]
+        var_name = AXIS_NAMES[axis]
+        features.update({f'{var_name}_{key}': round(float(value), 5)
+                         for key, value in zip(STAT_NAMES, values)})
+    return features
+
+
+def parse_sensor_csv(csv_bytes):
+    """Parses a numeric sensor CSV straight into a float64 array.
+
+    A leading byte-order mark is skipped and header names are stripped of
+    surrounding whitespace. Blank lines and rows with missing, non-numeric or
+    non-finite (nan, inf) cells are dropped. Returns the column names and a
+    (n_rows, n_columns) array.
+    """
+    # Excel 등에서 저장한 CSV는 BOM으로 시작할 수 있음
+    lines = str(csv_bytes, 'utf-8-sig').splitlines()
+    if not lines:
+        raise ValueError("Empty CSV file")
+
+    columns = [name.strip() for name in lines[0].split(',')]
+    rows = [line for line in lines[1:] if line.strip()]
+
+    try:
+        data = np.loadtxt(rows, delimiter=',', dtype=np.float64, ndmin=2)
+        if data.shape[1] != len(columns):
+            data = None
+    except ValueError:
+        data = None
+
+    if data is None:
+        # 잘못된 row가 섞여 있으면 한 줄씩 파싱하여 버리기
+        parsed = []
+        for line in rows:
+            cells = line.split(',')
+            if len(cells) != len(columns):
+                continue
+            try:
+                parsed.append([float(cell) for cell in cells])
+            except ValueError:
+                continue
+        data = np.array(parsed, dtype=np.float64).reshape(-1, len(columns))
+
+    # nan/inf cell이 있는 row도 버리기 (pandas dropna와 같이)
+    return columns, data[np.isfinite(data).all(axis=1)]
+
+
 # 1. 모든 컬럼에 대하여, 각 컬럼의 모든 데이터에서 해당 컬럼의 0번째 row의 값을 빼기
-def subtract_first_row(df):
-    return df - df.iloc[0]
+def subtract_first_row(data):
+    return data - data[0]
 
 
-# 2. new_time이라는 새로운 컬럼을 만들기
-def add_new_time_column(df, time_interval=0.05):
-    max_sampling_time = df['SamplingTime'].max()
-    new_time = np.arange(0, max_sampling_time + time_interval, time_interval)
-    return pd.DataFrame({'new_time': new_time})
+# 2. 0.05초 간격의 새로운 시간축 만들기
+def add_new_time_column(sampling_time, time_interval=0.05):
+    return np.arange(0, sampling_time.max() + time_interval, time_interval)
 
 
 # 3. 선형보간을 통해 AccelerationX, AccelerationY, AccelerationZ, GyroX, GyroY, GyroZ 컬럼 보간
-def interpolate_columns(df, new_df, var_list):
-    # 기존 데이터프레임의 SamplingTime과 new_time을 기준으로 보간
-    for col in var_list:
-        new_df[col] = np.interp(new_df['new_time'], df['SamplingTime'], df[col])
-    return new_df
+def interpolate_columns(sampling_time, new_time, signals):
+    # 기존 SamplingTime과 new_time을 기준으로 각 축(row)을 보간
+    return np.stack([np.interp(new_time, sampling_time, signal) for signal in signals])
 
 
 # 4. 정가운데 인덱스 기준으로 앞뒤로 100개 데이터(5초 분량)만 남기기
-def extract_center_segment(df, window_size=100):
-    mid_idx = len(df) // 2
+def extract_center_segment(signals, window_size=100):
+    length = signals.shape[-1]
+    mid_idx = length // 2
     start_idx = max(0, mid_idx - window_size // 2)
-    end_idx = min(len(df), mid_idx + window_size // 2)
-    return df.iloc[start_idx:end_idx]
-
+    end_idx = min(length, mid_idx + window_size // 2)
+    return signals[..., start_idx:end_idx]
+
+
+
+# str.splitlines()가 줄바꿈으로 취급하는 제어 문자 (\r, \n 제외)
+_OTHER_LINE_BREAKS = [b'\x0b', b'\x0c', b'\x1c', b'\x1d', b'\x1e']
+
+
+def _scan_lines(buf, n_columns, time_col):
+    """Start offsets and SamplingTime values of the well-formed lines in ``buf``.
+
+    ``buf`` holds complete lines, each ending with ``\n``. A line is
+    well-formed when it has ``n_columns`` cells; only its time cell is
+    parsed. Returns None if ``buf`` needs ``parse_sensor_csv``'s handling
+    (non-ASCII text, other line breaks, unparsable time cells).
+    """
+    if not buf.isascii() or any(char in buf for char in _OTHER_LINE_BREAKS):
+        return None
+    if b'\r' in buf and buf.count(b'\r') != buf.count(b'\r\n'):
+        return None
+
+    arr = np.frombuffer(buf, dtype=np.uint8)
+
+    ends = np.flatnonzero(arr == ord('\n'))
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    commas = np.flatnonzero(arr == ord(','))
+    # 각 line 앞까지의 comma 개수
+    before = np.searchsorted(commas, starts)
+    valid = np.searchsorted(commas, ends) - before == n_columns - 1
+    starts, ends, before = starts[valid], ends[valid], before[valid]
+    if len(starts) == 0:
+        return starts, np.empty(0)
+
+    field_start = commas[before + time_col - 1] + 1 if time_col > 0 else starts
+    field_end = commas[before + time_col] if time_col < n_columns - 1 else ends
+    width = int((field_end - field_start).max())
+    if width > 64:
+        return None
+
+    # 고정 폭 byte 문자열로 모아서 한 번에 float 변환 (뒤쪽 0 byte는 무시됨)
+    offsets = np.arange(width)
+    index = np.minimum(field_start[:, None] + offsets, len(arr) - 1)
+    fields = np.where(offsets < (field_end - field_start)[:, None], arr[index], 0).astype(np.uint8)
+    try:
+        times = fields.view(f'S{width}').ravel().astype(np.float64)
+    except ValueError:
+        return None
+    return starts, times
+
+
+def read_center_window(csv_file, var_list, window_size=100, time_interval=0.05, chunk_size=1 << 20):
+    """The center segment of ``preprocess_csv`` without parsing the whole CSV.
+
+    The first pass reads ``csv_file`` in chunks and keeps only the offset and
+    SamplingTime of each row. That fixes the 0.05 s grid and its center
+    window, and the second pass seeks back to parse just the first and last
+    row and the rows around the window. Returns ``(sampling_time,
+    window_time, signals)`` for ``interpolate_columns``, which gives the same
+    (n_axes, window_size) array as the full path. Returns None when the
+    file needs the full path: missing columns, rows that are malformed or
+    non-finite where they matter, or times that are not strictly increasing. ``csv_file`` is
+    left at the position it started from.
+    """
+    origin = csv_file.tell()
+    try:
+        return _read_center_window(csv_file, origin, var_list, window_size, time_interval, chunk_size)
+    finally:
+        csv_file.seek(origin)
+
+
+def _read_center_window(csv_file, origin, var_list, window_size, time_interval, chunk_size):
+    # 1차: header, 각 row의 시작 위치와 SamplingTime
+    columns = None
+    row_starts, row_times = [], []
+    position, carry = origin, b''
+    while True:
+        chunk = bytes(csv_file.read(chunk_size))
+        buf = carry + chunk
+        if chunk:
+            last = buf.rfind(b'\n') + 1
+        else:
+            # 마지막 줄에는 줄바꿈이 없을 수 있음
+            buf, last = (buf + b'\n', len(buf) + 1) if buf else (buf, 0)
+        carry, buf = buf[last:], buf[:last]
+        base, position = position, position + len(buf)
+
+        if columns is None and buf:
+            header_end = buf.index(b'\n') + 1
+            header = buf[:header_end].rstrip(b'\r\n')
+            if not header.isascii():
+                return None
+            columns = [name.strip() for name in header.decode('ascii').split(',')]
+            if any(col not in columns for col in ['SamplingTime'] + var_list):
+                return None
+            base += header_end
+            buf = buf[header_end:]
+
+        if buf:
+            scanned = _scan_lines(buf, len(columns), columns.index('SamplingTime'))
+            if scanned is None:
+                return None
+            row_starts.append(scanned[0] + base)
+            row_times.append(scanned[1])
+        if not chunk:
+            break
+
+    if not row_starts:
+        return None
+    row_starts, times = np.concatenate(row_starts), np.concatenate(row_times)
+    if len(times) < 2 or not (np.diff(times) > 0).all():
+        return None
+
+    # subtract_first_row, add_new_time_column, extract_center_segment와 같은 계산
+    sampling_time = times - times[0]
+    window_time = extract_center_segment(add_new_time_column(sampling_time, time_interval), window_size)
+
+    # window의 각 시점을 감싸는 row 구간 (np.interp가 사용하는 row와 같음)
+    first = max(0, int(np.searchsorted(sampling_time, window_time[0], side='right')) - 1)
+    last = min(len(times) - 1, int(np.searchsorted(sampling_time, window_time[-1], side='left')))
+
+    # 2차: 첫 row, 마지막 row, window 구간 row만 파싱
+    def parse_rows(start, stop):
+        csv_file.seek(row_starts[start])
+        size = row_starts[stop] - row_starts[start] if stop < len(row_starts) else -1
+        buf = bytes(csv_file.read(size))
+        rows = []
+        for offset in row_starts[start:stop] - row_starts[start]:
+            line_end = buf.find(b'\n', offset)
+            line = buf[offset:line_end if line_end >= 0 else len(buf)].decode('ascii')
+            rows.append([float(cell) for cell in line.split(',')])
+        return np.array(rows, dtype=np.float64)
+
+    try:
+        head, window, tail = parse_rows(0, 1), parse_rows(first, last + 1), parse_rows(len(times) - 1, len(times))
+    except ValueError:
+        # 숫자가 아닌 cell이 있는 row는 전체 경로에서 버려지므로 그쪽으로 처리
+        return None
+
+    # nan/inf cell이 있는 row도 전체 경로에서 버려짐
+    if not all(np.isfinite(rows).all() for rows in (head, window, tail)):
+        return None
+    time_col = columns.index('SamplingTime')
+    if head[0, time_col] != times[0] or tail[0, time_col] != times[-1]:
+        return None
+    data = subtract_first_row(np.concatenate([head, window]))[1:]
+    return data[:, time_col], window_time, data[:, [columns.index(col) for col in var_list]].T
 
 # 사다리꼴 적분으로 속도와 변위를 구하는 함수
 def integrate(data: list, delta_t: float, var: int):
@@ -89,67 +314,88 @@ def integrate(data: list, delta_t: float, var: int):
     return to_return
 
 
-# dictionary를 바탕으로 표준화를 수행하는 함수
-def standardize_new_data(new_df, mean_std_dict):
-    for col in new_df.columns:
-        if col in mean_std_dict:
-            mean = mean_std_dict[col]['mean']
-            std = mean_std_dict[col]['std']
-            new_df[col] = (new_df[col] - mean) / std
-    return new_df
+class ArmFeatureTransform:
+    """Standardization and PCA projection of the arm features as one affine map.
+
+    ``weights`` is (n_components, n_features) in ``FEATURE_NAMES`` order, so a
+    feature vector from ``extract_all`` becomes PCA components with a single
+    ``weights @ x + bias``.
+    """
+
+    # 학습 시 PCA 입력으로 사용된 54개 변수 (mean 대신 mcr이 두 번 선택됨)
+    SELECTED_STATS = ['mcr', 'std', 'max', 'min', 'mcr', 'peak', 'rms', 'grad', 'grad_1000']
+
+    def __init__(self, weights, bias):
+        self.weights = weights
+        self.bias = bias
+        self.columns = [f'pca_var_{i}' for i in range(1, len(weights) + 1)]
 
+    @classmethod
+    def load(cls, params_dir=PREPROCESSING_PARAMS_DIR):
+        mean_std_df = pd.read_csv(os.path.join(params_dir, 'csv_mean_std_df.csv'))
+        mean_std = mean_std_df.set_index('feature')
 
+        components_df = pd.read_csv(os.path.join(params_dir, 'csv_PCA_result.csv'))
+        pca_loadings = components_df.iloc[:, 1:].values  # 첫 번째 컬럼(Unnamed: 0)은 제외
 
+        # (x - mean) / std 를 PCA loading에 합쳐서 하나의 affine 변환으로 만들기
+        selected = [f'{front}_{back}' for front in AXIS_NAMES for back in cls.SELECTED_STATS]
+        weights = np.zeros((len(pca_loadings), len(FEATURE_NAMES)))
+        bias = np.zeros(len(pca_loadings))
+        for col, name in enumerate(selected):
+            mean, std = mean_std.loc[name, 'mean'], mean_std.loc[name, 'std']
+            weights[:, FEATURE_NAMES.index(name)] += pca_loadings[:, col] / std
+            bias -= pca_loadings[:, col] * mean / std
 
-def preprocess_csv(csv_file):
-    csv_content = csv_file.stream.read().decode('utf-8')
+        return cls(weights, bias)
 
-    df = pd.read_csv(StringIO(csv_content))
-    data_feature, current_data = [], {}
+    def transform(self, features):
+        """Maps (n_features,) or (n_samples, n_features) to PCA components."""
+        return np.atleast_2d(features) @ self.weights.T + self.bias
 
-    # 기본 데이터 정리
+
+FEATURE_NAMES = [f'{front}_{back}' for front in AXIS_NAMES for back in STAT_NAMES]
+
+arm_transform = ArmFeatureTransform.load()
+
+
+def preprocess_csv(csv_file, transform=None):
+    transform = transform or arm_transform
     var_list = ['AccelerationX', 'AccelerationY', 'AccelerationZ', 'GyroX', 'GyroY', 'GyroZ']
-    df.columns = df.columns.str.strip()
-    df = df.apply(lambda col: col.map(lambda x: x.strip() if isinstance(x, str) else x))
-    df.replace('', np.nan, inplace=True)
-    df = df.dropna()
-
-    # interpolation으로 시간 간격 조정, 가운데 시간 구간만 추출
-    df = subtract_first_row(df)
-    df = interpolate_columns(df, add_new_time_column(df, 0.05), var_list)
-    df = extract_center_segment(df)
-    df = df[['new_time'] + var_list]
-
-    # feature 추출하여 데이터프레임 형식으로 변환
-    for var in range(6):
-        current_data.update(extract(df[var_list[var]].tolist(), var))
-    data_feature.append(current_data)
-    df = pd.DataFrame(data_feature)
-
-    # 기존 표준화 데이터셋 활용하여 데이터 정규화
-    mean_std_df = pd.read_csv(os.path.join(PREPROCESSING_PARAMS_DIR, 'csv_mean_std_df.csv'))
-    mean_std_dict = {}
-    
-    # mean_std_df 구조 변경에 맞춰 dictionary 생성 방식 수정
-    for _, row in mean_std_df.iterrows():
-        mean_std_dict[row['feature']] = {
-            'mean': row['mean'],
-            'std': row['std']
-        }
-    
-    df = standardize_new_data(df, mean_std_dict)
-
-    # 54개 변수 선택 (velocity, location 제외)
-    axis = ['AccX', 'AccY', 'AccZ', 'GyrX', 'GyrY', 'GyrZ']
-    stats = ['mcr', 'std', 'max', 'min', 'mcr', 'peak', 'rms', 'grad', 'grad_1000']
-    variables = [f'{front}_{back}' for front in axis for back in stats]
-    df = df[variables]
-
-    # 주성분분석으로 8개 feature로 축소 (이전 11개에서 변경)
-    components_df = pd.read_csv(os.path.join(PREPROCESSING_PARAMS_DIR, 'csv_PCA_result.csv'))
-    pca_loadings = components_df.iloc[:, 1:].values  # 첫 번째 컬럼(Unnamed: 0)은 제외
-    pca_transformed = df.values @ pca_loadings.T
-    pca_columns = [f'pca_var_{i}' for i in range(1, 9)]  # 8개 컴포넌트로 변경
-    df = pd.DataFrame(pca_transformed, columns=pca_columns)
-    
-    return df
\ No newline at end of file
+
+    # 가운데 window 주변 row만 파싱, 불가능한 파일은 전체 파싱
+    seekable = getattr(csv_file, 'seekable', None)
+    if seekable is None or not seekable():
+        csv_file = BytesIO(csv_file.read())
+    with timed('arm', 'read_window'):
+        window = read_center_window(csv_file, var_list)
+
+    if window is not None:
+        with timed('arm', 'interpolate'):
+            signals = interpolate_columns(*window)
+    else:
+        with timed('arm', 'csv_parse'):
+            columns, data = parse_sensor_csv(csv_file.read())
+
+        # 기본 데이터 정리
+        missing = [col for col in ['SamplingTime'] + var_list if col not in columns]
+        if missing:
+            raise ValueError(f"Missing columns in CSV: {', '.join(missing)}")
+        if len(data) == 0:
+            raise ValueError("No valid rows in CSV")
+
+        # interpolation으로 시간 간격 조정, 가운데 시간 구간만 추출
+        with timed('arm', 'interpolate'):
+            data = subtract_first_row(data)
+            sampling_time = data[:, columns.index('SamplingTime')]
+            signals = data[:, [columns.index(col) for col in var_list]].T
+            signals = interpolate_columns(sampling_time, add_new_time_column(sampling_time, 0.05), signals)
+            signals = extract_center_segment(signals)
+
+    # feature 추출 후 표준화 + 주성분분석으로 8개 feature로 축소
+    with timed('arm', 'features'):
+        features = extract_all(signals)
+    with timed('arm', 'transform'):
+        pca_transformed = transform.transform([features[name] for name in FEATURE_NAMES])
+
+    return pd.DataFrame(pca_transformed, columns=transform.columns)
@@ -0,0 +1,63 @@
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+# modality -> (module, function); modules are imported on first use
+PREPROCESSORS = {
+    'face': ('app.preprocessing.image_processing', 'extract_face_features'),
+    'arm': ('app.preprocessing.csv_processing', 'preprocess_csv'),
+    'speech': ('app.preprocessing.audio_processing', 'preprocess_audio'),
+}
+
+
+def get_preprocessor(modality):
+    module, name = PREPROCESSORS[modality]
+    return getattr(importlib.import_module(module), name)
+
+
+def _init_worker(modalities):
+    # Forked workers inherit the preprocessing modules the parent imported
+    # (dlib predictor, librosa, scalers); this is a no-op for those and loads
+    # the rest once per worker instead of on the first request.
+    for modality in modalities:
+        get_preprocessor(modality)
+
+
+def _warm_up():
+    return True
+
+
+def _run(modality, data):
+    return get_preprocessor(modality)(BytesIO(data))
+
+
+class PreprocessExecutor:
+    """Pool of worker processes running the CPU-bound ``preprocess_*`` steps.
+
+    Request threads only read the upload bytes and send them to a worker, which
+    returns the small feature array, so preprocessing no longer serializes on
+    the GIL of the server process.
+    """
+
+    def __init__(self, max_workers, modalities=tuple(PREPROCESSORS), start_method='fork'):
+        self.max_workers = max_workers
+        # 워커가 물려받도록 fork 전에 사용할 전처리 모듈만 import
+        for modality in modalities:
+            get_preprocessor(modality)
+        self._pool = ProcessPoolExecutor(max_workers=max_workers,
+                                         mp_context=multiprocessing.get_context(start_method),
+                                         initializer=_init_worker, initargs=(tuple(modalities),))
+        # 모델 로딩(TensorFlow 스레드 생성) 전에 워커 프로세스를 미리 띄워 두기
+        for future in [self._pool.submit(_warm_up) for _ in range(max_workers)]:
+            future.result()
+
+    def submit(self, modality, data):
+        return self._pool.submit(_run, modality, data)
+
+    def preprocess(self, modality, file):
+        # memoryview(ASGI 업로드)는 pickle 불가
+        return self.submit(modality, bytes(file.read())).result()
+
+    def shutdown(self):
+        self._pool.shutdown()
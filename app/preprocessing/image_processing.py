@@ -1,113 +1,216 @@
 import os
-import math
+import queue
+import threading
+from contextlib import contextmanager
 
 import cv2
 import dlib
 import joblib
 import numpy as np
 
-from config import PREPROCESSING_PARAMS_DIR
+from app.metrics import timed
+from config import FACE_DECODE_MIN_DIM, FACE_DETECTION_MAX_DIM, FACE_DETECTOR_POOL_SIZE, PREPROCESSING_PARAMS_DIR
 
 detector = dlib.get_frontal_face_detector()
 predictor = dlib.shape_predictor(os.path.join(PREPROCESSING_PARAMS_DIR, 'shape_predictor_68_face_landmarks.dat'))
 scaler = joblib.load(os.path.join(PREPROCESSING_PARAMS_DIR, 'face_scaler.pkl'))
 norm = joblib.load(os.path.join(PREPROCESSING_PARAMS_DIR, 'face_norm.pkl'))
 
-def get_landmark_list(landmarks):
-    landmark_list = []
-    for n in range(0, 68):
-        x = landmarks.part(n).x
-        y = landmarks.part(n).y
-        landmark_list.append((x, y))
-    return landmark_list
-
-def is_frontal_face(landmarks):
-    # Left eye, right eye, nose tip
-    left_eye = (landmarks.part(36).x, landmarks.part(36).y)
-    right_eye = (landmarks.part(45).x, landmarks.part(45).y)
-    nose_tip = (landmarks.part(27).x, landmarks.part(27).y)
-
-    x1, y1 = nose_tip
-    x2, y2 = left_eye
-    x3, y3 = right_eye
-
-    left_to_nose = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-    right_to_nose = math.sqrt((x3 - x1) ** 2 + (y3 - y1) ** 2)
-
-    # Ratio of distances between eyes and nose
-    ratio = left_to_nose / right_to_nose
-
-    return ratio
-
-def get_sym_mouth(landmark_list):
-    mouth_land = landmark_list[48:]
-    ml = mouth_land
-
-    sym_mouth = [
-        (ml[0], ml[6]),
-        (ml[1], ml[5]),
-        (ml[2], ml[4]),
-        (ml[7], ml[11]),
-        (ml[8], ml[10]),
-        (ml[12], ml[16]),
-        (ml[13], ml[15]),
-        (ml[17], ml[19])
-    ]
-
-    return sym_mouth
-    
-def distances_ratio_with_eye(landmark_list):
-    sym_mouth = get_sym_mouth(landmark_list)
-    sym_mouth = [sym_mouth[0], sym_mouth[1], sym_mouth[3], sym_mouth[5]]
-
-    left_eye = landmark_list[39]
-    right_eye = landmark_list[42]
-    x1, y1 = left_eye
-    x3, y3 = right_eye
-
-    distances = []
-
-    for left_mouth, right_mouth in sym_mouth:
-        x2, y2 = left_mouth
-        x4, y4 = right_mouth
-        left_distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-        right_distance = math.sqrt((x4 - x3)**2 + (y4 - y3)**2)
-        distance = left_distance / right_distance
-        distance = max(distance, 1/distance)
-        distances.append(distance)
-
-    return distances
 
-
-def preprocess_image(image_file):
+class DetectorPool:
+    """Bounded pool of dlib HOG face detectors shared by all threads.
+
+    A detector must not be called from two threads at once (dlib crashes),
+    and building one takes about half a second, so detectors are checked
+    out per call: new ones are built only while fewer than ``max_size``
+    exist, after that callers wait for a free one.
+    """
+
+    def __init__(self, max_size, initial=()):
+        self.max_size = max_size
+        self._idle = queue.Queue()
+        for instance in initial:
+            self._idle.put(instance)
+        self.created = len(initial)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def detector(self):
+        try:
+            instance = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                build = self.created < self.max_size
+                if build:
+                    self.created += 1
+            instance = dlib.get_frontal_face_detector() if build else self._idle.get()
+        try:
+            yield instance
+        finally:
+            self._idle.put(instance)
+
+
+detector_pool = DetectorPool(FACE_DETECTOR_POOL_SIZE, initial=[detector])
+
+
+# JPEG markers without a length field, and the SOF markers carrying the frame size
+_JPEG_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_REDUCED_GRAYSCALE_MODES = [(8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+                            (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+                            (2, cv2.IMREAD_REDUCED_GRAYSCALE_2)]
+
+
+def jpeg_dimensions(data):
+    """Returns ``(width, height)`` from the SOF header of a JPEG, or None."""
+    if data[:2] != b'\xff\xd8':
+        return None
+
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # fill byte
+            pos += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker == 0xDA:
+            # 이미지 데이터 시작 (SOS) 전에 SOF가 없음
+            return None
+
+        length = int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > len(data):
+                return None
+            height = int.from_bytes(data[pos + 5:pos + 7], 'big')
+            width = int.from_bytes(data[pos + 7:pos + 9], 'big')
+            return width, height
+        pos += 2 + length
+    return None
+
+
+def decode_grayscale(image_bytes, min_dim=FACE_DECODE_MIN_DIM):
+    """Decodes an upload straight to grayscale, applying the EXIF orientation.
+
+    JPEGs whose longest side is at least 2x ``min_dim`` are decoded at 1/2,
+    1/4 or 1/8 scale (libjpeg DCT scaling), the smallest that keeps the
+    longest side >= ``min_dim``; 0 always decodes at full size.
+    """
+    flag = cv2.IMREAD_GRAYSCALE
+    dimensions = jpeg_dimensions(image_bytes) if min_dim else None
+    if dimensions is not None:
+        for factor, reduced_flag in _REDUCED_GRAYSCALE_MODES:
+            if max(dimensions) // factor >= min_dim:
+                flag = reduced_flag
+                break
+
+    gray = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flag)
+    if gray is None:
+        raise ValueError("Could not decode the image file.")
+    return gray
+
+
+def detect_face(gray, max_dim=FACE_DETECTION_MAX_DIM):
+    """Returns the first detected face in ``gray`` coordinates, or None.
+
+    The HOG detector runs on a copy downscaled to ``max_dim`` (0 = full
+    resolution) and the rectangle is scaled back. Scales grow 2x at a time up
+    to the full image, and the search stops at the first one with a face.
+    """
+    height, width = gray.shape[:2]
+    scale = max(height, width) / max_dim if max_dim else 1.0
+
+    with detector_pool.detector() as detect:
+        while scale > 1.0:
+            size = (max(1, round(width / scale)), max(1, round(height / scale)))
+            faces = detect(cv2.resize(gray, size, interpolation=cv2.INTER_AREA))
+            if len(faces) > 0:
+                face = faces[0]
+                sx, sy = width / size[0], height / size[1]
+                return dlib.rectangle(round(face.left() * sx), round(face.top() * sy),
+                                      round(face.right() * sx), round(face.bottom() * sy))
+            scale /= 2
+
+        faces = detect(gray)
+    return faces[0] if len(faces) > 0 else None
+
+
+# Landmark indices: eyes and nose for the frontal check, and the inner eye
+# corners with the symmetric mouth point pairs for the distance ratios
+LEFT_EYE, RIGHT_EYE, NOSE = 36, 45, 27
+LEFT_EYE_INNER, RIGHT_EYE_INNER = 39, 42
+LEFT_MOUTH = np.array([48, 49, 55, 60])
+RIGHT_MOUTH = np.array([54, 53, 59, 64])
+
+
+def landmarks_to_array(landmarks):
+    """dlib shape -> (68, 2) int array of (x, y)."""
+    return np.array([(point.x, point.y) for point in landmarks.parts()], dtype=np.int64)
+
+
+def _distance(a, b):
+    # 정수 좌표의 제곱합은 정확하므로 math.sqrt와 같은 값
+    return np.sqrt(np.sum((a - b) ** 2, axis=-1))
+
+
+def frontal_ratio(points):
+    """Left eye-nose / right eye-nose distance for (68, 2) or (N, 68, 2) landmark arrays."""
+    left_to_nose = _distance(points[..., LEFT_EYE, :], points[..., NOSE, :])
+    right_to_nose = _distance(points[..., RIGHT_EYE, :], points[..., NOSE, :])
+    return left_to_nose / right_to_nose
+
+
+def eye_distance_ratios(points):
+    """Mouth-to-inner-eye distance ratios (>= 1) of four symmetric mouth point pairs.
+
+    Accepts (68, 2) or (N, 68, 2) landmark arrays.
+    """
+    left_distance = _distance(points[..., LEFT_MOUTH, :], points[..., np.newaxis, LEFT_EYE_INNER, :])
+    right_distance = _distance(points[..., RIGHT_MOUTH, :], points[..., np.newaxis, RIGHT_EYE_INNER, :])
+    distance = left_distance / right_distance
+    return np.maximum(distance, 1 / distance)
+
+
+def extract_face_features(image_file):
+    """Image upload -> unscaled (1, 4) mouth/eye distance ratios."""
     image_bytes = image_file.read()
 
-    # Convert bytes to numpy array
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    faces = detector(gray)
+    # Decode bytes to a grayscale numpy array
+    with timed('face', 'decode'):
+        gray = decode_grayscale(image_bytes)
+
+    with timed('face', 'detect'):
+        face = detect_face(gray)
 
-    if len(faces) == 0:
+    if face is None:
         raise ValueError("No face detected. Please provide an image with a clear frontal face.")
 
-    face = faces[0]
-    landmarks = predictor(gray, face)
+    # 68-point landmark는 원본 해상도에서 추출
+    with timed('face', 'landmarks'):
+        landmarks = predictor(gray, face)
+
+    points = landmarks_to_array(landmarks)
 
     # Check if the face is frontal
-    ratio = is_frontal_face(landmarks)
+    ratio = float(frontal_ratio(points))
     if not (0.88 < ratio < 1.12):
         raise ValueError(f"Face is not frontal. Ratio: {ratio}")
 
-    # Get landmarks and calculate distances
-    landmark_list = get_landmark_list(landmarks)
-    distances = distances_ratio_with_eye(landmark_list)
+    # Calculate distances
+    with timed('face', 'features'):
+        return eye_distance_ratios(points).reshape(1, -1)
+
 
-    # Convert to numpy array and reshape
-    face_data_array = np.array(distances).reshape(1, -1)
+def preprocess_image(image_file):
+    face_data_array = extract_face_features(image_file)
 
     # Scale the data
-    face_data_scaled = scaler.transform(face_data_array)
-    face_data_scaled = norm.transform(face_data_scaled)
+    with timed('face', 'scale'):
+        face_data_scaled = scaler.transform(face_data_array)
+        face_data_scaled = norm.transform(face_data_scaled)
 
     return face_data_scaled
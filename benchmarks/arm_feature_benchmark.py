@@ -0,0 +1,82 @@
+# benchmarks/arm_feature_benchmark.py
+
+import time
+import statistics
+import json
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+import sys
+sys.path.append(str(project_root))
+
+from app.preprocessing.csv_processing import extract, extract_all
+
+
+class ArmFeatureBenchmark:
+    """Compares the list-based arm feature extractor with the vectorized one."""
+
+    def __init__(self, iterations=1000, window_size=100):
+        self.iterations = iterations
+        self.results_dir = project_root / 'benchmarks' / 'results'
+        self.results_dir.mkdir(exist_ok=True)
+        self.signals = np.random.default_rng(0).normal(size=(6, window_size))
+
+    def measure(self, func):
+        for _ in range(10):
+            func()
+
+        times = []
+        for _ in range(self.iterations):
+            start_time = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start_time)
+
+        return {
+            'mean': statistics.mean(times),
+            'median': statistics.median(times),
+            'min': min(times),
+            'samples': self.iterations
+        }
+
+    def run_reference(self):
+        features = {}
+        for var in range(6):
+            features.update(extract(self.signals[var].tolist(), var))
+        return features
+
+    def run_vectorized(self):
+        return extract_all(self.signals)
+
+    def run(self):
+        reference = self.run_reference()
+        vectorized = self.run_vectorized()
+        if reference != vectorized:
+            raise AssertionError("Vectorized features differ from the reference implementation")
+
+        results = {
+            'reference': self.measure(self.run_reference),
+            'vectorized': self.measure(self.run_vectorized),
+        }
+        results['speedup'] = results['reference']['mean'] / results['vectorized']['mean']
+
+        print("\nArm Feature Extraction Benchmarks")
+        print("=" * 50)
+        for name in ['reference', 'vectorized']:
+            print(f"{name:<12} mean {results[name]['mean']*1e6:9.1f} us   "
+                  f"median {results[name]['median']*1e6:9.1f} us")
+        print(f"Speedup: {results['speedup']:.1f}x")
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        result_file = self.results_dir / f'arm_feature_results_{timestamp}.json'
+        with open(result_file, 'w') as f:
+            json.dump(results, f, indent=4)
+
+        print(f"\nResults saved to: {result_file}")
+        return results
+
+
+if __name__ == '__main__':
+    ArmFeatureBenchmark().run()
@@ -0,0 +1,91 @@
+# benchmarks/face_detection_benchmark.py
+
+import time
+import statistics
+import json
+from pathlib import Path
+
+import cv2
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+import sys
+sys.path.append(str(project_root))
+
+from app.preprocessing.image_processing import detect_face
+from config import FACE_DETECTION_MAX_DIM
+
+
+class FaceDetectionBenchmark:
+    """Face detection latency vs image size, at full resolution and downscaled.
+
+    The test JPEGs are upscaled to several sizes (up to ~12 MP) to stand in
+    for phone photos.
+    """
+
+    def __init__(self, iterations=5, scales=(1, 2, 4, 8, 16), max_dim=FACE_DETECTION_MAX_DIM or 640):
+        self.iterations = iterations
+        self.scales = scales
+        self.max_dim = max_dim
+        self.results_dir = project_root / 'benchmarks' / 'results'
+        self.results_dir.mkdir(exist_ok=True)
+        self.images = {
+            name: cv2.imread(str(project_root / 'tests' / 'examples' / name), cv2.IMREAD_GRAYSCALE)
+            for name in ['positive_sample_face.jpg', 'negative_sample_face.jpg']
+        }
+
+    def measure(self, func):
+        func()
+
+        times = []
+        for _ in range(self.iterations):
+            start_time = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start_time)
+
+        return {
+            'mean': statistics.mean(times),
+            'median': statistics.median(times),
+            'min': min(times),
+            'samples': self.iterations
+        }
+
+    def run(self):
+        results = {}
+
+        print("\nFace Detection Benchmarks")
+        print("=" * 70)
+        for name, image in self.images.items():
+            results[name] = []
+            for scale in self.scales:
+                gray = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+                full = self.measure(lambda: detect_face(gray, max_dim=0))
+                downscaled = self.measure(lambda: detect_face(gray, max_dim=self.max_dim))
+                face = detect_face(gray, max_dim=self.max_dim)
+
+                entry = {
+                    'width': gray.shape[1],
+                    'height': gray.shape[0],
+                    'megapixels': gray.size / 1e6,
+                    'face_found': face is not None,
+                    'full_resolution': full,
+                    'downscaled': downscaled,
+                    'speedup': full['mean'] / downscaled['mean'],
+                }
+                results[name].append(entry)
+                print(f"{name:<26} {gray.shape[1]:>5}x{gray.shape[0]:<5} "
+                      f"full {full['mean']*1e3:8.1f} ms   "
+                      f"max_dim={self.max_dim} {downscaled['mean']*1e3:7.1f} ms   "
+                      f"speedup {entry['speedup']:5.1f}x")
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        result_file = self.results_dir / f'face_detection_results_{timestamp}.json'
+        with open(result_file, 'w') as f:
+            json.dump(results, f, indent=4)
+
+        print(f"\nResults saved to: {result_file}")
+        return results
+
+
+if __name__ == '__main__':
+    FaceDetectionBenchmark().run()
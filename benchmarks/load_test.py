@@ -0,0 +1,162 @@
+# benchmarks/load_test.py
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+ENDPOINTS = {
+    'arm': ('csv', 'positive_sample_arm.csv', 'text/csv'),
+    'face': ('image', 'positive_sample_face.jpg', 'image/jpeg'),
+    'speech': ('audio', 'positive_sample_audio.wav', 'audio/wav'),
+}
+
+
+class LoadTest:
+    """Throughput of the gunicorn server (gunicorn.conf.py) vs worker count.
+
+    For every worker count a fresh server is started, and each endpoint is hit
+    by ``concurrency`` client threads for ``duration`` seconds.
+    """
+
+    def __init__(self, worker_counts, endpoints=tuple(ENDPOINTS), concurrency=None, duration=10.0, threads=4):
+        self.worker_counts = worker_counts
+        self.endpoints = endpoints
+        self.concurrency = concurrency
+        self.duration = duration
+        self.threads = threads
+        self.results_dir = project_root / 'benchmarks' / 'results'
+        self.results_dir.mkdir(exist_ok=True)
+
+        examples_dir = project_root / 'tests' / 'examples'
+        self.payloads = {name: (field, filename, (examples_dir / filename).read_bytes(), content_type)
+                         for name, (field, filename, content_type) in ENDPOINTS.items()}
+
+    @staticmethod
+    def free_port():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def start_server(self, workers):
+        port = self.free_port()
+        env = dict(os.environ, STROKE_BIND=f'127.0.0.1:{port}', STROKE_WORKERS=str(workers),
+                   STROKE_THREADS=str(self.threads), STROKE_MODALITIES=','.join(self.endpoints))
+        server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app'],
+                                  cwd=project_root, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base_url = f'http://127.0.0.1:{port}'
+
+        # 모든 worker가 모델을 로드할 때까지 대기
+        deadline = time.monotonic() + 300
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(f'{base_url}/api/ready', timeout=1).status_code == 200:
+                    time.sleep(2 * workers)
+                    return server, base_url
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+
+        self.stop_server(server)
+        raise RuntimeError(f"Server with {workers} workers did not become ready")
+
+    @staticmethod
+    def stop_server(server):
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    def hammer(self, base_url, endpoint, concurrency):
+        field, filename, data, content_type = self.payloads[endpoint]
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+        stop_at = time.monotonic() + self.duration
+
+        def client():
+            session = requests.Session()
+            while time.monotonic() < stop_at:
+                start_time = time.perf_counter()
+                try:
+                    response = session.post(f'{base_url}/api/{endpoint}',
+                                            files={field: (filename, data, content_type)})
+                    ok = response.status_code == 200
+                except requests.RequestException:
+                    ok = False
+                elapsed = time.perf_counter() - start_time
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors[0] += 1
+
+        clients = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+
+        latencies.sort()
+        return {
+            'concurrency': concurrency,
+            'requests': len(latencies),
+            'errors': errors[0],
+            'throughput': len(latencies) / self.duration,
+            'latency_median': statistics.median(latencies) if latencies else None,
+            'latency_p95': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+
+    def run(self):
+        results = {'cpu_count': os.cpu_count(), 'threads_per_worker': self.threads, 'runs': []}
+
+        print("\nLoad Test (gunicorn, preloaded models)")
+        print("=" * 70)
+        for workers in self.worker_counts:
+            server, base_url = self.start_server(workers)
+            try:
+                for endpoint in self.endpoints:
+                    concurrency = self.concurrency or 2 * workers * self.threads
+                    entry = {'workers': workers, 'endpoint': endpoint,
+                             **self.hammer(base_url, endpoint, concurrency)}
+                    results['runs'].append(entry)
+                    median = entry['latency_median'] or 0.0
+                    print(f"workers {workers:>2}  {endpoint:<7} {entry['throughput']:8.1f} req/s   "
+                          f"median {median*1e3:7.1f} ms   errors {entry['errors']}")
+            finally:
+                self.stop_server(server)
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        result_file = self.results_dir / f'load_test_results_{timestamp}.json'
+        with open(result_file, 'w') as f:
+            json.dump(results, f, indent=4)
+
+        print(f"\nResults saved to: {result_file}")
+        return results
+
+
+if __name__ == '__main__':
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description="Throughput of the gunicorn server vs worker count")
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Client threads per endpoint (default: 2 x workers x threads)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument('--threads', type=int, default=4, help="Threads per gunicorn worker")
+    args = parser.parse_args()
+
+    LoadTest(args.workers, args.endpoints, args.concurrency, args.duration, args.threads).run()
@@ -0,0 +1,149 @@
+# benchmarks/speech_quantization_benchmark.py
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from config import SPEECH_MODEL_PATH
+
+# name -> SPEECH_INFERENCE_MODE; 'float32-tflite' (the float32 model on the
+# TFLite runtime) separates the runtime change from the precision change
+ENGINES = {
+    'float32': 'float32',
+    'float32-tflite': None,
+    'float16': 'float16',
+    'int8': 'int8',
+}
+TEST_WAVS = ['positive_sample_audio.wav', 'negative_sample_audio.wav']
+
+
+def rss_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class SpeechQuantizationBenchmark:
+    """Reduced-precision speech CNN (SPEECH_INFERENCE_MODE) vs the float32 baseline.
+
+    Each engine is loaded in a fresh process so its memory can be measured.
+    Reports the score of every test WAV and its difference from float32,
+    model size, load time, resident memory added by loading, and the median
+    inference latency at batch size 1 and ``batch_size``.
+    """
+
+    def __init__(self, engines=tuple(ENGINES), iterations=200, batch_size=8):
+        self.engines = engines
+        self.iterations = iterations
+        self.batch_size = batch_size
+        self.results_dir = project_root / 'benchmarks' / 'results'
+        self.results_dir.mkdir(exist_ok=True)
+
+    @staticmethod
+    def measure(name, iterations, batch_size):
+        import numpy as np
+        from app.models.speech_inference import (KerasInference, TFLiteInference, load_keras_model,
+                                                 load_speech_inference)
+        from app.preprocessing import preprocess_audio
+
+        examples_dir = project_root / 'tests' / 'examples'
+        audio = []
+        for wav in TEST_WAVS:
+            with open(examples_dir / wav, 'rb') as f:
+                audio.append(preprocess_audio(f))
+        audio = np.concatenate(audio)
+        batch = np.repeat(audio, -(-batch_size // len(audio)), axis=0)[:batch_size]
+
+        gc.collect()
+        rss_before = rss_bytes()
+        start_time = time.perf_counter()
+        mode = ENGINES[name]
+        if mode is None:
+            engine = TFLiteInference(model_content=KerasInference(load_keras_model(SPEECH_MODEL_PATH)).to_tflite())
+        else:
+            engine = load_speech_inference(SPEECH_MODEL_PATH, mode)
+        load_time = time.perf_counter() - start_time
+
+        if isinstance(engine, TFLiteInference):
+            model_size = len(engine.model_content)
+        else:
+            model_size = sum(weight.numpy().nbytes for weight in engine.model.weights)
+
+        latencies = {}
+        for size, inputs in [(1, audio[:1]), (batch_size, batch)]:
+            for _ in range(10):
+                engine(inputs)
+            times = []
+            for _ in range(iterations):
+                start_time = time.perf_counter()
+                engine(inputs)
+                times.append(time.perf_counter() - start_time)
+            latencies[size] = statistics.median(times)
+
+        gc.collect()
+        return {
+            'scores': dict(zip(TEST_WAVS, engine(audio).ravel().tolist())),
+            'model_size': model_size,
+            'load_time': load_time,
+            'rss_increase': rss_bytes() - rss_before,
+            'latency_batch_1': latencies[1],
+            f'latency_batch_{batch_size}': latencies[batch_size],
+        }
+
+    def run(self):
+        results = {}
+        # 메모리 측정을 위해 engine마다 새 프로세스에서 로드
+        context = multiprocessing.get_context('spawn')
+        for name in self.engines:
+            with context.Pool(1) as pool:
+                results[name] = pool.apply(self.measure, (name, self.iterations, self.batch_size))
+
+        baseline = results.get('float32')
+        if baseline is not None:
+            for entry in results.values():
+                entry['max_score_diff'] = max(abs(entry['scores'][wav] - baseline['scores'][wav]) for wav in TEST_WAVS)
+                entry['same_class'] = all((entry['scores'][wav] > 0.5) == (baseline['scores'][wav] > 0.5)
+                                          for wav in TEST_WAVS)
+
+        print("\nSpeech CNN precision modes")
+        print("=" * 70)
+        for name, entry in results.items():
+            print(f"\n{name.upper()}")
+            print("-" * 30)
+            for wav, score in entry['scores'].items():
+                print(f"Score {wav:<27} {score:.6f}")
+            if 'max_score_diff' in entry:
+                print(f"Max score diff vs float32:  {entry['max_score_diff']:.2e}  "
+                      f"(same class: {entry['same_class']})")
+            print(f"Model size:      {entry['model_size'] / 1024:.1f} KiB")
+            print(f"Load time:       {entry['load_time']*1000:.0f} ms")
+            print(f"RSS increase:    {entry['rss_increase'] / 2**20:.1f} MiB")
+            print(f"Latency batch 1: {entry['latency_batch_1']*1000:.2f} ms")
+            print(f"Latency batch {self.batch_size}: {entry[f'latency_batch_{self.batch_size}']*1000:.2f} ms")
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        result_file = self.results_dir / f'speech_quantization_results_{timestamp}.json'
+        with open(result_file, 'w') as f:
+            json.dump(results, f, indent=4)
+
+        print(f"\nResults saved to: {result_file}")
+        return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reduced-precision speech CNN vs the float32 baseline")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=8)
+    args = parser.parse_args()
+
+    SpeechQuantizationBenchmark(args.engines, args.iterations, args.batch_size).run()
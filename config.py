@@ -10,4 +10,80 @@ TRAINED_MODELS_DIR = os.path.join(MODELS_DIR, 'trained')
 PREPROCESSING_PARAMS_DIR = os.path.join(PREPROCESSING_DIR, 'parameters')
 
 TESTS_DIR = os.path.join(BASE_DIR, 'tests' )
-TEST_EXAMPLES_DIR = os.path.join(TESTS_DIR, 'examples')
\ No newline at end of file
+TEST_EXAMPLES_DIR = os.path.join(TESTS_DIR, 'examples')
+
+# Modalities served by this process (e.g. STROKE_MODALITIES=arm for an
+# arm-only worker that never imports TensorFlow or dlib)
+ENABLED_MODALITIES = tuple(name.strip() for name in os.environ.get('STROKE_MODALITIES', 'face,arm,speech').split(',')
+                           if name.strip())
+
+# When models load: 'eager' (before serving), 'background' (in threads at
+# startup, see /api/ready) or 'lazy' (on the first request of a modality)
+MODEL_LOADING = os.environ.get('STROKE_MODEL_LOADING', 'background')
+
+# Speech model artifact: the trained .keras file, or an exported SavedModel
+# directory / .tflite file (see app/models/speech_inference.py)
+SPEECH_MODEL_PATH = os.path.join(TRAINED_MODELS_DIR, 'speech_model.keras')
+
+# Speech CNN precision: 'float32' (the trained Keras model), or 'float16' /
+# 'int8' (converted to TFLite with BatchNorm folded and float16 / int8
+# dynamic-range weights when the .keras model loads)
+SPEECH_INFERENCE_MODE = os.environ.get('STROKE_SPEECH_INFERENCE_MODE', 'float32')
+
+# Speech micro-batching: concurrent requests are grouped into one model call.
+# SPEECH_BATCH_MAX_SIZE = 1 disables batching.
+SPEECH_BATCH_MAX_SIZE = 8
+SPEECH_BATCH_MAX_WAIT_MS = 5
+
+
+# Batch endpoints (/api/<modality>/batch)
+BATCH_MAX_FILES = 64
+BATCH_PREPROCESS_WORKERS = 4
+
+# Large JPEG uploads are decoded at 1/2, 1/4 or 1/8 scale while their longest
+# side stays >= this; 0 = always decode at full resolution
+FACE_DECODE_MIN_DIM = 1280
+
+# dlib face detectors shared by the request threads (each is used by one
+# thread at a time; more concurrent face requests wait for a free one)
+FACE_DETECTOR_POOL_SIZE = 4
+
+# Face detection runs on the image downscaled to this max width/height
+# (landmarks still use the full image); 0 = detect at full resolution
+FACE_DETECTION_MAX_DIM = 640
+
+# Worker processes for preprocess_* (0 = preprocess in the request thread)
+PREPROCESS_WORKERS = 0
+
+# Weights of each modality's score in the fused /api/assess score
+ASSESS_FUSION_WEIGHTS = {'face': 1.0, 'arm': 1.0, 'speech': 1.0}
+
+# Threads running preprocessing and inference for the Flask routes (/assess
+# runs its modalities concurrently on them)
+REQUEST_WORKER_THREADS = 8
+
+# Per-request deadline on preprocessing and inference; a request that runs
+# longer gets 504 (its work finishes in the background). 0 = no limit
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get('STROKE_REQUEST_TIMEOUT', 30))
+
+# Result cache for repeated uploads of the same file
+RESULT_CACHE_ENABLED = False
+RESULT_CACHE_MAX_ENTRIES = 1024
+RESULT_CACHE_TTL_SECONDS = 600
+
+# ASGI front end (uvicorn asgi:app): largest accepted request body (also the
+# limit for /speech/stream bodies on Flask) and the threads running
+# preprocessing/inference off the event loop
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+ASGI_WORKER_THREADS = 8
+
+# Production server (gunicorn -c gunicorn.conf.py run:app); one server per
+# modality group (STROKE_MODALITIES) gives each its own worker/thread counts
+SERVER_BIND = os.environ.get('STROKE_BIND', '127.0.0.1:5000')
+SERVER_WORKERS = int(os.environ.get('STROKE_WORKERS', os.cpu_count() or 1))
+SERVER_THREADS = int(os.environ.get('STROKE_THREADS', 4))
+# gthread workers keep heartbeating while a request thread is busy, so
+# SERVER_TIMEOUT only replaces a worker whose main loop is stuck; single
+# requests are bounded by REQUEST_TIMEOUT_SECONDS
+SERVER_TIMEOUT = int(os.environ.get('STROKE_TIMEOUT', 60))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('STROKE_GRACEFUL_TIMEOUT', 30))
@@ -0,0 +1,54 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py run:app
+
+import gc
+import os
+
+# 마스터에서는 로더 스레드를 띄우지 않음 (스레드는 fork 후 worker에 남지 않음)
+# 모델은 아래 hook에서 마스터 / worker 별로 로드
+os.environ['STROKE_MODEL_LOADING'] = 'lazy'
+
+from config import (ENABLED_MODALITIES, PREPROCESS_WORKERS, SERVER_BIND, SERVER_GRACEFUL_TIMEOUT,
+                    SERVER_THREADS, SERVER_TIMEOUT, SERVER_WORKERS)
+
+if PREPROCESS_WORKERS > 0:
+    # The process pool's management threads do not survive the fork into the
+    # gunicorn workers; the workers themselves take over its role.
+    raise RuntimeError("Set PREPROCESS_WORKERS = 0 when serving with gunicorn")
+
+bind = SERVER_BIND
+workers = SERVER_WORKERS
+threads = SERVER_THREADS
+worker_class = 'gthread'
+# gthread worker의 main loop는 요청 스레드가 멈춰 있어도 heartbeat를 보내므로 이 값은
+# main loop가 멈춘 worker만 교체함; 요청별 제한은 REQUEST_TIMEOUT_SECONDS (504)
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+preload_app = True
+
+# Loaded once in the master and shared copy-on-write by every worker. The
+# speech model is not: TensorFlow's runtime thread pools (and the speech
+# micro-batcher thread) do not survive fork, so each worker loads its own.
+PRELOADED_MODALITIES = ('face', 'arm')
+
+
+def when_ready(server):
+    from app.api.routes import model_registry
+
+    for modality in PRELOADED_MODALITIES:
+        if modality in ENABLED_MODALITIES:
+            model_registry.get(modality)
+            server.log.info("Loaded %s model in the master", modality)
+
+    # 마스터의 객체를 GC 대상에서 제외해 worker에서 refcount/GC로 페이지가 복사되지 않도록
+    gc.collect()
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from app.api.routes import model_registry
+
+    # 나머지 모델은 요청을 받기 전에 worker에서 로드
+    for modality in model_registry.modalities:
+        model_registry.get(modality)
+    worker.log.info("Worker %s ready: %s", worker.pid, model_registry.status())
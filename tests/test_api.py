@@ -1,8 +1,24 @@
 import unittest
+import asyncio
+import importlib.util
 import json
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import mock
 from flask import Flask
-from app.api.routes import api_bp
-from config import TEST_EXAMPLES_DIR
+from app.api.multipart import MultipartParser, RequestTooLargeError
+from app.api.routes import api_bp, model_registry
+from app.main import create_app, create_asgi_app
+from app.models.registry import ModelRegistry, ModelUnavailableError
+from config import BASE_DIR, REQUEST_WORKER_THREADS, TEST_EXAMPLES_DIR
 import os
 
 class TestAPIIntegration(unittest.TestCase):
@@ -104,6 +120,199 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertEqual(data['result']['stroke'], 0)
         self.assertLess(data['result']['score'], 0.5)
 
+    def test_arm_batch_analysis(self):
+        with open(self.positive_csv, 'rb') as positive, open(self.negative_csv, 'rb') as negative, \
+                open(os.path.join(TEST_EXAMPLES_DIR, 'invalid_sample.csv'), 'rb') as invalid:
+            response = self.client.post(
+                '/api/arm/batch',
+                data={'csv': [(positive, 'positive_sample_arm.csv'),
+                              (invalid, 'invalid_sample.csv'),
+                              (negative, 'negative_sample_arm.csv')]},
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)['results']
+        self.assertEqual([r['filename'] for r in results],
+                         ['positive_sample_arm.csv', 'invalid_sample.csv', 'negative_sample_arm.csv'])
+        self.assertEqual(results[0]['result']['stroke'], 1)
+        self.assertIn('error', results[1])
+        self.assertEqual(results[2]['result']['stroke'], 0)
+
+    def test_speech_stream_analysis(self):
+        with open(os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_audio.wav'), 'rb') as audio_file:
+            data = audio_file.read()
+            audio_file.seek(0)
+            expected = self.client.post('/api/speech', data={'audio': (audio_file, 'positive_sample_audio.wav')},
+                                        content_type='multipart/form-data').get_json()
+
+        response = self.client.post('/api/speech/stream', data=data, content_type='audio/wav')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), expected)
+
+        response = self.client.post('/api/speech/stream', data=b'', content_type='audio/wav')
+        self.assertEqual(response.status_code, 400)
+
+    def test_speech_stream_too_large(self):
+        with open(os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_audio.wav'), 'rb') as audio_file:
+            data = audio_file.read()
+        model = model_registry.get('speech')
+        with mock.patch('app.api.routes.MAX_UPLOAD_BYTES', 100000), \
+                mock.patch.object(model, 'predict_stream') as predict_stream:
+            response = self.client.post('/api/speech/stream', data=data, content_type='audio/wav')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json(), {'error': 'Request body exceeds 100000 bytes'})
+        predict_stream.assert_not_called()
+
+    def test_speech_batch_analysis(self):
+        with open(self.positive_audio, 'rb') as positive, open(self.negative_audio, 'rb') as negative:
+            response = self.client.post(
+                '/api/speech/batch',
+                data={'audio': [(positive, 'positive_sample_audio.wav'),
+                                (negative, 'negative_sample_audio.wav')]},
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)['results']
+        self.assertEqual(results[0]['result']['stroke'], 1)
+        self.assertGreater(results[0]['result']['score'], 0.5)
+        self.assertEqual(results[1]['result']['stroke'], 0)
+        self.assertLess(results[1]['result']['score'], 0.5)
+
+    def test_face_batch_analysis(self):
+        with open(self.positive_image, 'rb') as positive, open(self.negative_image, 'rb') as negative, \
+                open(os.path.join(TEST_EXAMPLES_DIR, 'non_face_image.jpg'), 'rb') as non_face:
+            response = self.client.post(
+                '/api/face/batch',
+                data={'image': [(positive, 'positive_sample_face.jpg'),
+                                (negative, 'negative_sample_face.jpg'),
+                                (non_face, 'non_face_image.jpg')]},
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)['results']
+        self.assertEqual(results[0]['result']['stroke'], 1)
+        self.assertEqual(results[1]['result']['stroke'], 0)
+        self.assertIn('error', results[2])
+
+    def test_assess_all_modalities(self):
+        with open(self.positive_image, 'rb') as image_file, open(self.positive_csv, 'rb') as csv_file, \
+                open(self.positive_audio, 'rb') as audio_file:
+            response = self.client.post(
+                '/api/assess',
+                data={'image': (image_file, 'positive_sample_face.jpg'),
+                      'csv': (csv_file, 'positive_sample_arm.csv'),
+                      'audio': (audio_file, 'positive_sample_audio.wav')},
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        for name in ['face', 'arm', 'speech']:
+            self.assertEqual(data['results'][name]['stroke'], 1)
+        self.assertEqual(data['fused']['modalities'], ['arm', 'face', 'speech'])
+        self.assertEqual(data['fused']['stroke'], 1)
+        self.assertGreater(data['fused']['score'], 0.5)
+
+    def test_concurrent_face_assess_reuses_detectors(self):
+        from app.preprocessing.image_processing import detector_pool
+
+        with open(self.positive_image, 'rb') as image_file:
+            image = image_file.read()
+
+        def assess(_):
+            response = self.app.test_client().post(
+                '/api/assess', data={'image': (BytesIO(image), 'positive_sample_face.jpg')},
+                content_type='multipart/form-data')
+            return response.status_code, json.loads(response.data)['results']['face']['stroke']
+
+        # 요청 스레드마다 detector를 새로 만들지 않음
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(assess, range(16))), [(200, 1)] * 16)
+        created = detector_pool.created
+        self.assertLessEqual(created, detector_pool.max_size)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(assess, range(16))), [(200, 1)] * 16)
+        self.assertEqual(detector_pool.created, created)
+
+    def test_request_timeout(self):
+        slow_model = mock.Mock()
+        slow_model.predict.side_effect = lambda file: time.sleep(0.5) or {"stroke": 0, "score": 0.0}
+        with mock.patch('app.api.routes.REQUEST_TIMEOUT_SECONDS', 0.1), \
+                mock.patch.object(model_registry, 'get', return_value=slow_model):
+            with open(self.positive_csv, 'rb') as csv_file:
+                response = self.client.post('/api/arm', data={'csv': (csv_file, 'positive_sample_arm.csv')},
+                                            content_type='multipart/form-data')
+            self.assertEqual(response.status_code, 504)
+            self.assertIn('did not finish', json.loads(response.data)['message'])
+
+            # /assess는 시간 초과된 modality만 오류로 기록
+            with open(self.positive_csv, 'rb') as csv_file:
+                response = self.client.post('/api/assess', data={'csv': (csv_file, 'positive_sample_arm.csv')},
+                                            content_type='multipart/form-data')
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertIn('did not finish', data['results']['arm']['error'])
+            self.assertIsNone(data['fused'])
+
+        # pool보다 많은 요청이 시간 초과되면 대기 중이던 작업은 취소되어 실행되지 않음
+        slow_model.predict.reset_mock()
+        slow_model.predict.side_effect = lambda file: time.sleep(1.0) or {"stroke": 0, "score": 0.0}
+
+        def post(i):
+            with open(self.positive_csv, 'rb') as csv_file:
+                data = {'csv': (csv_file, 'positive_sample_arm.csv')}
+                if i % 2:
+                    return self.client.post('/api/assess', data=data, content_type='multipart/form-data')
+                return self.client.post('/api/arm', data=data, content_type='multipart/form-data')
+
+        with mock.patch('app.api.routes.REQUEST_TIMEOUT_SECONDS', 0.2), \
+                mock.patch.object(model_registry, 'get', return_value=slow_model):
+            with ThreadPoolExecutor(max_workers=24) as executor:
+                responses = list(executor.map(post, range(24)))
+            self.assertEqual([r.status_code for r in responses], [504, 200] * 12)
+            time.sleep(1.5)
+        self.assertLessEqual(slow_model.predict.call_count, REQUEST_WORKER_THREADS)
+
+    def test_assess_partial_with_error(self):
+        with open(self.negative_csv, 'rb') as csv_file, \
+                open(os.path.join(TEST_EXAMPLES_DIR, 'non_face_image.jpg'), 'rb') as image_file:
+            response = self.client.post(
+                '/api/assess',
+                data={'csv': (csv_file, 'negative_sample_arm.csv'),
+                      'image': (image_file, 'non_face_image.jpg')},
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertNotIn('speech', data['results'])
+        self.assertIn('error', data['results']['face'])
+        self.assertEqual(data['fused']['modalities'], ['arm'])
+        self.assertEqual(data['fused']['score'], data['results']['arm']['score'])
+
+    def test_metrics_endpoint(self):
+        client = create_app().test_client()
+        with open(self.positive_csv, 'rb') as csv_file:
+            response = client.post(
+                '/api/arm',
+                data={'csv': (csv_file, 'positive_sample_arm.csv')},
+                content_type='multipart/form-data'
+            )
+        self.assertEqual(response.status_code, 200)
+
+        response = client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        body = response.get_data(as_text=True)
+        # 'parse'는 multipart 요청 파싱, CSV 읽기는 별도 stage
+        for stage in ['parse', 'read_window', 'preprocess', 'interpolate', 'features', 'transform', 'inference']:
+            self.assertIn(f'stroke_stage_duration_seconds_count{{modality="arm",stage="{stage}"}}', body)
+        self.assertIn('stroke_request_duration_seconds_bucket{endpoint="api.arm_analysis",status="200",le="+Inf"}',
+                      body)
+
     def test_missing_file(self):
         response = self.client.post('/api/face', data={})
         self.assertEqual(response.status_code, 400)
@@ -123,5 +332,284 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertIn('error', data)
         self.assertEqual(data['error'], 'No Audio file')
 
+        response = self.client.post('/api/assess', data={})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)['error'], 'No image, CSV or audio file')
+
+        response = self.client.post('/api/arm/batch', data={})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)['error'], 'No CSV files')
+
+    def test_ready_endpoint(self):
+        for modality in model_registry.modalities:
+            model_registry.get(modality)
+
+        response = self.client.get('/api/ready')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertTrue(data['ready'])
+        self.assertEqual(data['models'], {'face': 'ready', 'arm': 'ready', 'speech': 'ready'})
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_lazy_loading(self):
+        registry = ModelRegistry(['arm'], mode='lazy')
+        registry.start()
+        self.assertEqual(registry.status(), {'arm': 'not_loaded'})
+        self.assertTrue(registry.ready())
+
+        model = registry.get('arm')
+        self.assertEqual(model.modality, 'arm')
+        self.assertIs(registry.get('arm'), model)
+        self.assertEqual(registry.status(), {'arm': 'ready'})
+
+    def test_disabled_modality(self):
+        registry = ModelRegistry(['arm'], mode='lazy')
+        with self.assertRaises(ModelUnavailableError):
+            registry.get('speech')
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            ModelRegistry(['arm', 'gait'])
+        with self.assertRaises(ValueError):
+            ModelRegistry(['arm'], mode='sometimes')
+
+    def test_failed_load(self):
+        with mock.patch.dict('app.models.registry.MODEL_CLASSES', {'arm': ('app.models.arm_model', 'Missing')}):
+            registry = ModelRegistry(['arm'], mode='background')
+            registry.start()
+            with self.assertRaises(ModelUnavailableError):
+                registry.get('arm')
+        self.assertEqual(registry.status(), {'arm': 'failed'})
+        self.assertFalse(registry.ready())
+
+        with mock.patch.dict('app.models.registry.MODEL_CLASSES', {'arm': ('app.models.arm_model', 'Missing')}):
+            with self.assertRaises(AttributeError):
+                ModelRegistry(['arm'], mode='eager').start()
+
+    def test_arm_only_process_skips_heavy_imports(self):
+        script = '''
+import json, sys
+from app.main import create_app
+client = create_app().test_client()
+with open(sys.argv[1], 'rb') as csv_file:
+    arm = client.post('/api/arm', data={'csv': (csv_file, 'arm.csv')}, content_type='multipart/form-data')
+with open(sys.argv[2], 'rb') as image_file:
+    face = client.post('/api/face', data={'image': (image_file, 'face.jpg')}, content_type='multipart/form-data')
+print(json.dumps({'arm': arm.status_code, 'face': face.status_code,
+                  'ready': client.get('/api/ready').status_code,
+                  'imported': [name for name in ['tensorflow', 'dlib', 'librosa'] if name in sys.modules]}))
+'''
+        env = dict(os.environ, STROKE_MODALITIES='arm', STROKE_MODEL_LOADING='eager')
+        args = [os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_arm.csv'),
+                os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_face.jpg')]
+        output = subprocess.run([sys.executable, '-c', script, *args], cwd=BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result, {'arm': 200, 'face': 503, 'ready': 200, 'imported': []})
+
+    def test_modalities_env_with_spaces(self):
+        env = dict(os.environ, STROKE_MODALITIES=' arm, face ,')
+        output = subprocess.run([sys.executable, '-c', 'import config; print(",".join(config.ENABLED_MODALITIES))'],
+                                cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'arm,face')
+
+
+def encode_multipart(files, boundary='stroke-test-boundary'):
+    body = b''
+    for name, (filename, data) in files.items():
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + b'\r\n'
+    return body + f'--{boundary}--\r\n'.encode(), f'multipart/form-data; boundary={boundary}'
+
+
+class TestMultipartParser(unittest.TestCase):
+    def parse(self, body, chunk_size, boundary=b'stroke-test-boundary', size_hint=None):
+        parser = MultipartParser(boundary, max_size=1 << 20, size_hint=size_hint)
+        for i in range(0, len(body), chunk_size):
+            parser.feed(body[i:i + chunk_size])
+        parser.close()
+        return parser
+
+    def test_parses_parts_across_chunk_boundaries(self):
+        image = bytes(range(256)) * 40 + b'\r\n--stroke-test'
+        body, _ = encode_multipart({'image': ('face.jpg', image), 'csv': ('arm.csv', b'a,b\r\n1,2\r\n')})
+        body = body.replace(b'--stroke-test-boundary\r\nContent-Disposition: form-data; name="csv"',
+                            b'--stroke-test-boundary\r\nContent-Disposition: form-data; name="note"\r\n\r\n'
+                            b'hello\r\n--stroke-test-boundary\r\nContent-Disposition: form-data; name="csv"')
+        for chunk_size in [1, 7, 64, 4096, len(body)]:
+            parser = self.parse(body, chunk_size, size_hint=len(body))
+            files, form = parser.fields()
+            self.assertEqual(bytes(files['image'].read()), image)
+            self.assertEqual(files['image'].filename, 'face.jpg')
+            self.assertEqual(bytes(files['csv'].read()), b'a,b\r\n1,2\r\n')
+            self.assertEqual(form, {'note': 'hello'})
+            # Content-Length 크기로 한 번만 할당
+            self.assertEqual(len(parser.buffer), len(body))
+
+    def test_size_limit_and_truncated_body(self):
+        body, _ = encode_multipart({'csv': ('arm.csv', b'x' * 1000)})
+        parser = MultipartParser(b'stroke-test-boundary', max_size=500)
+        with self.assertRaises(RequestTooLargeError):
+            parser.feed(body)
+
+        parser = MultipartParser(b'stroke-test-boundary', max_size=1 << 20)
+        parser.feed(body[:-10])
+        with self.assertRaises(ValueError):
+            parser.close()
+
+
+class TestASGIApp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_asgi_app()
+
+    def call(self, method, path, body=b'', content_type=None, chunk_size=1024):
+        headers = [(b'content-length', str(len(body)).encode())]
+        if content_type:
+            headers.append((b'content-type', content_type.encode()))
+        scope = {'type': 'http', 'method': method, 'path': path, 'headers': headers, 'query_string': b'',
+                 'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('client', 1)}
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b'']
+        messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                    for i, chunk in enumerate(chunks)]
+        sent = []
+
+        async def receive():
+            # 느린 업로드처럼 chunk 사이에 event loop 양보
+            await asyncio.sleep(0)
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.app(scope, receive, send))
+        return sent[0]['status'], b''.join(message.get('body', b'') for message in sent[1:])
+
+    def post_files(self, path, files, chunk_size=1024):
+        payload = {}
+        for field, name in files.items():
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                payload[field] = (name, file.read())
+        body, content_type = encode_multipart(payload)
+        status, data = self.call('POST', path, body, content_type, chunk_size)
+        return status, json.loads(data)
+
+    def test_upload_endpoints(self):
+        for path, field, name, stroke in [('/api/arm', 'csv', 'positive_sample_arm.csv', 1),
+                                          ('/api/face', 'image', 'negative_sample_face.jpg', 0),
+                                          ('/api/speech', 'audio', 'negative_sample_audio.wav', 0)]:
+            status, data = self.post_files(path, {field: name})
+            self.assertEqual(status, 200)
+            self.assertEqual(data['result']['stroke'], stroke)
+
+    def test_matches_flask_result(self):
+        client = create_app().test_client()
+        with open(os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_face.jpg'), 'rb') as image_file:
+            expected = client.post('/api/face', data={'image': (image_file, 'positive_sample_face.jpg')},
+                                   content_type='multipart/form-data').get_json()
+        status, data = self.post_files('/api/face', {'image': 'positive_sample_face.jpg'}, chunk_size=100)
+        self.assertEqual(status, 200)
+        self.assertEqual(data, expected)
+
+    def test_speech_stream(self):
+        with open(os.path.join(TEST_EXAMPLES_DIR, 'negative_sample_audio.wav'), 'rb') as audio_file:
+            data = audio_file.read()
+        expected = self.post_files('/api/speech', {'audio': 'negative_sample_audio.wav'})[1]
+
+        status, body = self.call('POST', '/api/speech/stream', data, 'audio/wav', chunk_size=4096)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), expected)
+
+        status, _ = self.call('POST', '/api/speech/stream', b'', 'audio/wav')
+        self.assertEqual(status, 400)
+
+    def test_assess(self):
+        status, data = self.post_files('/api/assess', {'csv': 'negative_sample_arm.csv',
+                                                       'image': 'non_face_image.jpg'})
+        self.assertEqual(status, 200)
+        self.assertIn('error', data['results']['face'])
+        self.assertEqual(data['fused']['modalities'], ['arm'])
+
+    def test_missing_file_and_limits(self):
+        status, data = self.call('POST', '/api/arm')
+        self.assertEqual((status, json.loads(data)), (400, {'error': 'No CSV files'}))
+
+        status, data = self.post_files('/api/face', {'csv': 'positive_sample_arm.csv'})
+        self.assertEqual((status, data), (400, {'error': 'No image file'}))
+
+        body, content_type = encode_multipart({'csv': ('arm.csv', b'x' * 2048)})
+        app, self.app.max_body_size = self.app.max_body_size, 1024
+        try:
+            status, _ = self.call('POST', '/api/arm', body, content_type)
+        finally:
+            self.app.max_body_size = app
+        self.assertEqual(status, 413)
+
+    def test_request_timeout(self):
+        slow_model = mock.Mock()
+        slow_model.predict.side_effect = lambda file: time.sleep(0.5) or {"stroke": 0, "score": 0.0}
+        timeout, self.app.request_timeout = self.app.request_timeout, 0.1
+        try:
+            with mock.patch.object(model_registry, 'get', return_value=slow_model):
+                status, data = self.post_files('/api/arm', {'csv': 'positive_sample_arm.csv'})
+        finally:
+            self.app.request_timeout = timeout
+        self.assertEqual(status, 504)
+        self.assertIn('did not finish', data['message'])
+
+    def test_other_routes_use_flask(self):
+        status, data = self.call('GET', '/api/ready')
+        self.assertIn(status, (200, 503))
+        self.assertIn('models', json.loads(data))
+
+        status, data = self.call('GET', '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn(b'stroke_request_duration_seconds', data)
+
+        status, data = self.call('GET', '/api/cache/stats')
+        self.assertEqual(status, 200)
+        self.assertIn('enabled', json.loads(data))
+
+
+@unittest.skipUnless(importlib.util.find_spec('gunicorn'), "gunicorn is not installed")
+class TestProductionServer(unittest.TestCase):
+    def test_preforked_arm_server(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        env = dict(os.environ, STROKE_MODALITIES='arm', STROKE_WORKERS='2', STROKE_BIND=f'127.0.0.1:{port}')
+
+        with tempfile.TemporaryFile() as log:
+            server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app'],
+                                      cwd=BASE_DIR, env=env, stdout=log, stderr=log)
+            try:
+                status = None
+                deadline = time.monotonic() + 60
+                while status != 200 and time.monotonic() < deadline:
+                    time.sleep(0.5)
+                    try:
+                        status = urllib.request.urlopen(f'http://127.0.0.1:{port}/api/ready', timeout=5).status
+                    except (urllib.error.URLError, ConnectionError):
+                        pass
+                self.assertEqual(status, 200)
+
+                with open(os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_arm.csv'), 'rb') as csv_file:
+                    body = csv_file.read()
+                boundary = 'stroke-test-boundary'
+                data = (f'--{boundary}\r\nContent-Disposition: form-data; name="csv"; filename="arm.csv"\r\n'
+                        f'Content-Type: text/csv\r\n\r\n').encode() + body + f'\r\n--{boundary}--\r\n'.encode()
+                request = urllib.request.Request(f'http://127.0.0.1:{port}/api/arm', data=data, headers={
+                    'Content-Type': f'multipart/form-data; boundary={boundary}'})
+                response = json.loads(urllib.request.urlopen(request, timeout=30).read())
+                self.assertEqual(response['result']['stroke'], 1)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+
+            log.seek(0)
+            self.assertIn(b'Loaded arm model in the master', log.read())
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,10 +1,20 @@
 import os
 from io import BytesIO
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
 from werkzeug.datastructures import FileStorage
 from app.preprocessing import preprocess_csv
+from app.preprocessing.csv_processing import (extract, extract_all,
+                                              ArmFeatureTransform, FEATURE_NAMES, parse_sensor_csv,
+                                              read_center_window, interpolate_columns, add_new_time_column,
+                                              extract_center_segment, subtract_first_row)
+from config import PREPROCESSING_PARAMS_DIR
 from app.models import ArmModel
+from app.models.arm_inference import CompiledForest
+from app.models.cache import ResultCache, LRUCacheBackend
+from app.preprocessing.executor import PreprocessExecutor
 from config import TEST_EXAMPLES_DIR
 
 class TestArmModelIntegration(unittest.TestCase):
@@ -65,6 +75,21 @@ class TestArmModelIntegration(unittest.TestCase):
         result2 = self.arm_model.predict(file_storage2)
         self.assertEqual(result1, result2)
 
+    def test_process_pool_preprocessing(self):
+        # 워커 프로세스에서 전처리한 결과가 동일한지 테스트
+        executor = PreprocessExecutor(max_workers=2)
+        try:
+            pooled_model = ArmModel(executor=executor)
+            for path in [self.positive_csv, self.negative_csv]:
+                self.assertEqual(pooled_model.predict(self.create_file_storage(path)),
+                                 self.arm_model.predict(self.create_file_storage(path)))
+
+            invalid_csv = os.path.join(TEST_EXAMPLES_DIR, 'invalid_sample.csv')
+            with self.assertRaises(ValueError):
+                pooled_model.predict(self.create_file_storage(invalid_csv))
+        finally:
+            executor.shutdown()
+
     def test_invalid_csv_format(self):
         # Test handling of invalid CSV format
         invalid_csv = os.path.join(TEST_EXAMPLES_DIR, 'invalid_sample.csv')
@@ -75,5 +100,241 @@ class TestArmModelIntegration(unittest.TestCase):
         with self.assertRaises(Exception):
             self.arm_model.predict(file_storage)
 
+class TestResultCache(unittest.TestCase):
+    def create_file_storage(self, file_path):
+        with open(file_path, 'rb') as file:
+            return FileStorage(stream=BytesIO(file.read()), filename=os.path.basename(file_path))
+
+    def test_repeat_upload_skips_preprocessing(self):
+        cache = ResultCache(LRUCacheBackend(max_entries=8, ttl_seconds=60))
+        model = ArmModel(cache=cache)
+        positive_csv = os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_arm.csv')
+
+        first = model.predict(self.create_file_storage(positive_csv))
+        with mock.patch.object(model, '_preprocess') as preprocess:
+            second = model.predict(self.create_file_storage(positive_csv))
+            batch = model.predict_batch([self.create_file_storage(positive_csv)])
+            preprocess.assert_not_called()
+
+        self.assertEqual(first, second)
+        self.assertEqual(batch, [first])
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'size': 1})
+
+    def test_lru_eviction_and_ttl(self):
+        backend = LRUCacheBackend(max_entries=2, ttl_seconds=60)
+        backend.set('a', {'score': 1})
+        backend.set('b', {'score': 2})
+        backend.get('a')
+        backend.set('c', {'score': 3})
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), {'score': 1})
+
+        expired = LRUCacheBackend(max_entries=2, ttl_seconds=-1)
+        expired.set('a', {'score': 1})
+        self.assertIsNone(expired.get('a'))
+
+    def test_key_depends_on_modality_version_and_content(self):
+        key = ResultCache.make_key('arm', 'v1', b'data')
+        self.assertNotEqual(key, ResultCache.make_key('face', 'v1', b'data'))
+        self.assertNotEqual(key, ResultCache.make_key('arm', 'v2', b'data'))
+        self.assertNotEqual(key, ResultCache.make_key('arm', 'v1', b'other'))
+        self.assertEqual(key, ResultCache.make_key('arm', 'v1', b'data'))
+
+
+class TestArmFeatureExtraction(unittest.TestCase):
+    def reference_features(self, signals):
+        features = {}
+        for var in range(len(signals)):
+            features.update(extract(signals[var].tolist(), var))
+        return features
+
+    def test_matches_reference_on_samples(self):
+        var_list = ['AccelerationX', 'AccelerationY', 'AccelerationZ', 'GyroX', 'GyroY', 'GyroZ']
+        for name in ['positive_sample_arm.csv', 'negative_sample_arm.csv']:
+            df = pd.read_csv(os.path.join(TEST_EXAMPLES_DIR, name))
+            df.columns = df.columns.str.strip()
+            signals = df[var_list].to_numpy().T[:, :100]
+
+            self.assertEqual(extract_all(signals), self.reference_features(signals))
+
+    def test_matches_reference_on_random_windows(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            signals = rng.normal(scale=rng.uniform(0.01, 10), size=(6, 100))
+            self.assertEqual(extract_all(signals), self.reference_features(signals))
+
+class TestSensorCsvParsing(unittest.TestCase):
+    def test_matches_pandas_on_samples(self):
+        for name in ['positive_sample_arm.csv', 'negative_sample_arm.csv']:
+            path = os.path.join(TEST_EXAMPLES_DIR, name)
+            with open(path, 'rb') as file:
+                columns, data = parse_sensor_csv(file.read())
+
+            df = pd.read_csv(path)
+            self.assertEqual(columns, list(df.columns.str.strip()))
+            np.testing.assert_array_equal(data, df.values)
+
+    def test_drops_bad_rows(self):
+        content = (b"SamplingTime , AccelerationX,AccelerationY\n"
+                   b"0.0, 1.0, 2.0\n"
+                   b"0.1, , 2.5\n"
+                   b"\n"
+                   b"0.2, abc, 3.0\n"
+                   b"0.3, 4.0\n"
+                   b"0.4, 5.0, 6.0 \n")
+        columns, data = parse_sensor_csv(content)
+
+        self.assertEqual(columns, ['SamplingTime', 'AccelerationX', 'AccelerationY'])
+        np.testing.assert_array_equal(data, [[0.0, 1.0, 2.0], [0.4, 5.0, 6.0]])
+
+    def test_drops_non_finite_rows(self):
+        content = (b"SamplingTime,AccelerationX,AccelerationY\n"
+                   b"0.0,1.0,2.0\n"
+                   b"0.1,nan,2.5\n"
+                   b"0.2,NaN,3.0\n"
+                   b"0.3,inf,3.5\n"
+                   b"0.4,5.0,6.0\n")
+        columns, data = parse_sensor_csv(content)
+        np.testing.assert_array_equal(data, [[0.0, 1.0, 2.0], [0.4, 5.0, 6.0]])
+
+        # 잘못된 row와 함께 섞여 있어도 같은 결과
+        columns, data = parse_sensor_csv(content + b"0.5,abc,7.0\n")
+        np.testing.assert_array_equal(data, [[0.0, 1.0, 2.0], [0.4, 5.0, 6.0]])
+
+    def test_byte_order_mark(self):
+        path = os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_arm.csv')
+        with open(path, 'rb') as file:
+            content = file.read()
+        columns, data = parse_sensor_csv(b'\xef\xbb\xbf' + content)
+        self.assertEqual(columns, parse_sensor_csv(content)[0])
+        np.testing.assert_array_equal(data, parse_sensor_csv(content)[1])
+
+        # BOM이 있는 파일도 preprocess_csv에서 같은 결과
+        np.testing.assert_array_equal(preprocess_csv(BytesIO(b'\xef\xbb\xbf' + content)).values,
+                                      preprocess_csv(BytesIO(content)).values)
+
+
+class TestCenterWindowReader(unittest.TestCase):
+    VAR_LIST = ['AccelerationX', 'AccelerationY', 'AccelerationZ', 'GyroX', 'GyroY', 'GyroZ']
+
+    def full_path(self, content):
+        # 전체 CSV를 파싱, 보간한 뒤 가운데 구간 추출
+        columns, data = parse_sensor_csv(content)
+        data = subtract_first_row(data)
+        sampling_time = data[:, columns.index('SamplingTime')]
+        signals = data[:, [columns.index(col) for col in self.VAR_LIST]].T
+        return extract_center_segment(
+            interpolate_columns(sampling_time, add_new_time_column(sampling_time), signals))
+
+    def read_window(self, content, chunk_size=1 << 20):
+        file = BytesIO(content)
+        window = read_center_window(file, self.VAR_LIST, chunk_size=chunk_size)
+        self.assertEqual(file.tell(), 0)
+        return window
+
+    @classmethod
+    def long_recording(cls, n_rows=20000):
+        rng = np.random.default_rng(0)
+        times = 1725887578.652244 + np.cumsum(rng.uniform(0.02, 0.045, n_rows))
+        values = rng.normal(scale=5, size=(n_rows, 9))
+        lines = ['SamplingTime, ' + ', '.join(cls.VAR_LIST + ['MagneticFieldX', 'MagneticFieldY', 'MagneticFieldZ'])]
+        lines += [f'{t:.6f}, ' + ', '.join(f'{v:.6f}' for v in row) for t, row in zip(times, values)]
+        return lines
+
+    @staticmethod
+    def join(lines, newline='\n'):
+        return newline.join(lines).encode()
+
+    def test_samples_match_full_path(self):
+        for name in ['positive_sample_arm.csv', 'negative_sample_arm.csv']:
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                content = file.read()
+            for chunk_size in [7, 1000, 1 << 20]:
+                window = self.read_window(content, chunk_size)
+                np.testing.assert_array_equal(interpolate_columns(*window), self.full_path(content))
+
+    def test_long_recording_matches_full_path(self):
+        lines = self.long_recording()
+        # 가운데에서 먼 곳의 잘못된 row, CRLF, 마지막 줄바꿈 없음
+        lines[100] = lines[100].rsplit(',', 1)[0]
+        lines.insert(200, '')
+        for newline in ['\n', '\r\n']:
+            content = self.join(lines, newline)
+            window = self.read_window(content, chunk_size=64 * 1024)
+            self.assertLess(window[0].shape[0], 200)
+            np.testing.assert_array_equal(interpolate_columns(*window), self.full_path(content))
+
+    def test_falls_back_to_full_parse(self):
+        lines = self.long_recording(2000)
+        unordered = lines.copy()
+        unordered[10], unordered[11] = unordered[11], unordered[10]
+        malformed = lines.copy()
+        malformed[1000] = malformed[1000].replace(',', ', abc,', 1).rsplit(',', 1)[0]
+        duplicated = lines[:1000] + lines[999:]
+        not_finite = lines.copy()
+        not_finite[1000] = not_finite[1000].replace(',', ', nan,', 1).rsplit(',', 1)[0]
+
+        for content in [self.join(unordered), self.join(malformed), self.join(duplicated),
+                        self.join(not_finite), self.join([lines[0].replace('GyroZ', 'Gyro')] + lines[1:]), b'']:
+            self.assertIsNone(self.read_window(content))
+
+        # 전체 경로로 처리된 결과도 같아야 함
+        for content in [self.join(unordered), self.join(malformed), self.join(not_finite)]:
+            expected = self.full_path(content)
+            features = extract_all(expected)
+            processed = preprocess_csv(BytesIO(content))
+            np.testing.assert_array_equal(
+                processed.values,
+                ArmFeatureTransform.load().transform([features[name] for name in FEATURE_NAMES]))
+
+
+class TestArmFeatureTransform(unittest.TestCase):
+    def test_matches_standardize_then_pca(self):
+        mean_std_df = pd.read_csv(os.path.join(PREPROCESSING_PARAMS_DIR, 'csv_mean_std_df.csv'))
+        components_df = pd.read_csv(os.path.join(PREPROCESSING_PARAMS_DIR, 'csv_PCA_result.csv'))
+        pca_loadings = components_df.iloc[:, 1:].values
+
+        rng = np.random.default_rng(0)
+        features = pd.DataFrame(rng.normal(size=(20, len(FEATURE_NAMES))), columns=FEATURE_NAMES)
+
+        # 기존 방식: 컬럼별 표준화 후 54개 변수 선택, PCA loading 곱
+        standardized = (features - mean_std_df.set_index('feature')['mean']) / \
+            mean_std_df.set_index('feature')['std']
+        selected = [f'{front}_{back}' for front in ['AccX', 'AccY', 'AccZ', 'GyrX', 'GyrY', 'GyrZ']
+                    for back in ArmFeatureTransform.SELECTED_STATS]
+        expected = standardized[selected].values @ pca_loadings.T
+
+        transform = ArmFeatureTransform.load()
+        np.testing.assert_allclose(transform.transform(features.values), expected, rtol=1e-10, atol=1e-10)
+        np.testing.assert_allclose(transform.transform(features.values[0]), expected[:1], rtol=1e-10, atol=1e-10)
+
+
+class TestCompiledForest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.forest = ArmModel().model
+        cls.engine = CompiledForest(cls.forest)
+
+    def test_matches_sklearn_exactly(self):
+        X = np.random.default_rng(0).normal(scale=3, size=(2000, 8))
+        np.testing.assert_array_equal(self.engine.predict_proba(X), self.forest.predict_proba(X))
+        np.testing.assert_array_equal(self.engine.predict(X), self.forest.predict(X))
+
+    def test_split_thresholds_match_sklearn(self):
+        # 분기 threshold 근처 (float32 cast 전후) 값으로 경계 비교 확인
+        thresholds = np.concatenate([tree.tree_.threshold[tree.tree_.children_left != -1]
+                                     for tree in self.forest.estimators_])
+        values = np.concatenate([thresholds, np.nextafter(thresholds, np.inf), np.nextafter(thresholds, -np.inf),
+                                 thresholds.astype(np.float32)])
+        X = np.random.default_rng(1).choice(values, size=(2000, 8))
+        np.testing.assert_array_equal(self.engine.predict_proba(X), self.forest.predict_proba(X))
+
+    def test_single_row(self):
+        X = np.random.default_rng(2).normal(size=(1, 8))
+        proba = self.engine.predict_proba(X)
+        self.assertEqual(proba.shape, (1, 2))
+        np.testing.assert_array_equal(proba, self.forest.predict_proba(X))
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
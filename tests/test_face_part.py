@@ -1,12 +1,22 @@
+import copy
+import math
 import os
+import struct
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from werkzeug.datastructures import FileStorage
 
+import cv2
+import dlib
 import numpy as np
 
 from app.models import FaceModel
+from app.models.face_inference import FaceMLPInference
 from app.preprocessing import preprocess_image
+from app.preprocessing.image_processing import (decode_grayscale, detect_face, detector, detector_pool,
+                                                extract_face_features, eye_distance_ratios, frontal_ratio,
+                                                jpeg_dimensions, landmarks_to_array, norm, scaler)
 from config import TEST_EXAMPLES_DIR
 
 class TestFaceModelIntegration(unittest.TestCase):
@@ -72,5 +82,182 @@ class TestFaceModelIntegration(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.face_model.predict(file_storage)
 
+    def test_concurrent_requests_reuse_detectors(self):
+        # 동시 요청은 pool의 detector를 재사용하고 결과는 단일 요청과 같아야 함
+        expected = self.face_model.predict(self.create_file_storage(self.positive_image))
+
+        def predict(_):
+            return self.face_model.predict(self.create_file_storage(self.positive_image))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(predict, range(16))), [expected] * 16)
+        created = detector_pool.created
+        self.assertLessEqual(created, detector_pool.max_size)
+
+        # 새 스레드에서도 detector를 다시 만들지 않음
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(predict, range(16))), [expected] * 16)
+        self.assertEqual(detector_pool.created, created)
+
+        batch = self.face_model.predict_batch([self.create_file_storage(self.positive_image) for _ in range(8)])
+        self.assertEqual(batch, [expected] * 8)
+        self.assertEqual(detector_pool.created, created)
+
+
+class TestDownscaledDetection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.face_model = FaceModel()
+        cls.images = {}
+        for name, stroke in [('positive_sample_face.jpg', 1), ('negative_sample_face.jpg', 0)]:
+            cls.images[name] = (cv2.imread(os.path.join(TEST_EXAMPLES_DIR, name), cv2.IMREAD_GRAYSCALE), stroke)
+
+    def test_small_images_use_full_resolution(self):
+        for gray, _ in self.images.values():
+            self.assertEqual(detect_face(gray, max_dim=640), detector(gray)[0])
+
+    def test_face_is_mapped_back_to_full_resolution(self):
+        for gray, _ in self.images.values():
+            large = cv2.resize(gray, None, fx=8, fy=8, interpolation=cv2.INTER_CUBIC)
+            expected = detect_face(gray, max_dim=0)
+            face = detect_face(large, max_dim=640)
+            for got, want in [(face.left(), expected.left()), (face.top(), expected.top()),
+                              (face.right(), expected.right()), (face.bottom(), expected.bottom())]:
+                self.assertAlmostEqual(got / 8, want, delta=0.1 * expected.width())
+
+    def test_large_images_keep_predictions(self):
+        for gray, stroke in self.images.values():
+            large = cv2.resize(gray, None, fx=8, fy=8, interpolation=cv2.INTER_CUBIC)
+            data = cv2.imencode('.jpg', large)[1].tobytes()
+            self.assertEqual(self.face_model.predict(BytesIO(data))['stroke'], stroke)
+
+    def test_no_face_returns_none(self):
+        self.assertIsNone(detect_face(np.zeros((2000, 1500), dtype=np.uint8), max_dim=640))
+
+
+class TestGrayscaleDecoding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.image = cv2.imread(os.path.join(TEST_EXAMPLES_DIR, 'positive_sample_face.jpg'))
+
+    def encode(self, image, ext='.jpg'):
+        return cv2.imencode(ext, image)[1].tobytes()
+
+    def test_reads_jpeg_dimensions(self):
+        for name in ['positive_sample_face.jpg', 'negative_sample_face.jpg']:
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                data = file.read()
+            height, width = cv2.imread(os.path.join(TEST_EXAMPLES_DIR, name)).shape[:2]
+            self.assertEqual(jpeg_dimensions(data), (width, height))
+        self.assertIsNone(jpeg_dimensions(self.encode(self.image, '.png')))
+
+    def test_small_images_decode_at_full_size(self):
+        data = self.encode(self.image)
+        np.testing.assert_array_equal(decode_grayscale(data), cv2.imdecode(np.frombuffer(data, np.uint8),
+                                                                            cv2.IMREAD_GRAYSCALE))
+
+    def test_large_jpeg_uses_reduced_decode(self):
+        # 3040x4240 -> 1/2 (1520x2120) is the smallest with the longest side >= 1280
+        data = self.encode(cv2.resize(self.image, None, fx=16, fy=16))
+        self.assertEqual(decode_grayscale(data, min_dim=1280).shape, (2120, 1520))
+        self.assertEqual(decode_grayscale(data, min_dim=500).shape, (530, 380))
+        self.assertEqual(decode_grayscale(data, min_dim=0).shape, (4240, 3040))
+
+    def test_exif_orientation_is_applied(self):
+        # APP1 segment with Orientation = 6 (rotate 90 degrees clockwise)
+        tiff = b'II*\x00' + struct.pack('<IH', 8, 1) + struct.pack('<HHII', 0x0112, 3, 1, 6) + struct.pack('<I', 0)
+        app1 = b'\xff\xe1' + struct.pack('>H', len(tiff) + 8) + b'Exif\x00\x00' + tiff
+        data = self.encode(self.image)
+        gray = decode_grayscale(data[:2] + app1 + data[2:])
+        self.assertEqual(gray.shape, self.image.shape[:2][::-1])
+
+    def test_invalid_data_raises(self):
+        with self.assertRaises(ValueError):
+            decode_grayscale(b'not an image')
+
+
+class TestLandmarkGeometry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.shapes = []
+        for _ in range(20):
+            points = [dlib.point(int(x), int(y)) for x, y in rng.integers(0, 4000, size=(68, 2))]
+            cls.shapes.append(dlib.full_object_detection(dlib.rectangle(0, 0, 4000, 4000), points))
+
+    @staticmethod
+    def reference_frontal_ratio(landmarks):
+        # 기존 list 기반 구현 (is_frontal_face)
+        x1, y1 = landmarks.part(27).x, landmarks.part(27).y
+        x2, y2 = landmarks.part(36).x, landmarks.part(36).y
+        x3, y3 = landmarks.part(45).x, landmarks.part(45).y
+        left_to_nose = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        right_to_nose = math.sqrt((x3 - x1) ** 2 + (y3 - y1) ** 2)
+        return left_to_nose / right_to_nose
+
+    @staticmethod
+    def reference_distance_ratios(landmarks):
+        # 기존 list 기반 구현 (distances_ratio_with_eye)
+        landmark_list = [(landmarks.part(n).x, landmarks.part(n).y) for n in range(68)]
+        ml = landmark_list[48:]
+        sym_mouth = [(ml[0], ml[6]), (ml[1], ml[5]), (ml[7], ml[11]), (ml[12], ml[16])]
+        x1, y1 = landmark_list[39]
+        x3, y3 = landmark_list[42]
+
+        distances = []
+        for (x2, y2), (x4, y4) in sym_mouth:
+            left_distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+            right_distance = math.sqrt((x4 - x3)**2 + (y4 - y3)**2)
+            distance = left_distance / right_distance
+            distances.append(max(distance, 1/distance))
+        return distances
+
+    def test_matches_list_based_features(self):
+        for shape in self.shapes:
+            points = landmarks_to_array(shape)
+            self.assertEqual(points.shape, (68, 2))
+            self.assertEqual(frontal_ratio(points), self.reference_frontal_ratio(shape))
+            np.testing.assert_array_equal(eye_distance_ratios(points), self.reference_distance_ratios(shape))
+
+    def test_batched_matches_single(self):
+        points = np.stack([landmarks_to_array(shape) for shape in self.shapes])
+        ratios = frontal_ratio(points)
+        distances = eye_distance_ratios(points)
+        self.assertEqual(distances.shape, (20, 4))
+        for i in range(len(points)):
+            self.assertEqual(ratios[i], frontal_ratio(points[i]))
+            np.testing.assert_array_equal(distances[i], eye_distance_ratios(points[i]))
+
+
+class TestFaceMLPInference(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.face_model = FaceModel()
+
+    def sklearn_proba(self, features):
+        return self.face_model.model.predict_proba(norm.transform(scaler.transform(features)))[:, 1]
+
+    def test_matches_sklearn_pipeline(self):
+        features = 1 + np.random.default_rng(0).normal(scale=0.1, size=(500, 4))
+        np.testing.assert_allclose(self.face_model.engine(features), self.sklearn_proba(features),
+                                   rtol=1e-10, atol=1e-12)
+
+    def test_matches_sklearn_on_sample_images(self):
+        for name in ['positive_sample_face.jpg', 'negative_sample_face.jpg']:
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                data = file.read()
+            features = extract_face_features(BytesIO(data))
+            np.testing.assert_array_equal(preprocess_image(BytesIO(data)),
+                                          norm.transform(scaler.transform(features)))
+            np.testing.assert_allclose(self.face_model.engine(features), self.sklearn_proba(features),
+                                       rtol=1e-10, atol=1e-12)
+
+    def test_rejects_clipping_normalizer(self):
+        clipping = copy.deepcopy(norm)
+        clipping.clip = True
+        with self.assertRaises(ValueError):
+            FaceMLPInference(scaler, clipping, self.face_model.model)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
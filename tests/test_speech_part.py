@@ -1,12 +1,23 @@
 import os
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from werkzeug.datastructures import FileStorage
+import librosa
 import numpy as np
+import soundfile as sf
 
 from app.models import SpeechModel
+from app.models.batching import MicroBatcher
+from app.models.speech_inference import (KerasInference, SavedModelInference, TFLiteInference,
+                                         fold_batch_norm, load_keras_model, load_speech_inference)
 from app.preprocessing import preprocess_audio
-from config import TEST_EXAMPLES_DIR
+from app.preprocessing.audio_processing import (MFCCExtractor, SpeechStream, adaptive_preemphasis,
+                                                band_energy_ratio, load_audio, nonsilent_intervals, read_wav,
+                                                resample, rms_normalize)
+from config import TEST_EXAMPLES_DIR, SPEECH_MODEL_PATH
 
 class TestSpeechModelIntegration(unittest.TestCase):
     @classmethod
@@ -67,5 +78,369 @@ class TestSpeechModelIntegration(unittest.TestCase):
         result2 = self.speech_model.predict(file_storage2)
         self.assertEqual(result1, result2)
 
+    def test_stream_matches_upload(self):
+        for path in [self.positive_audio, self.negative_audio]:
+            with open(path, 'rb') as file:
+                data = file.read()
+            stream = self.speech_model.open_stream()
+            for start in range(0, len(data), 8192):
+                stream.feed(data[start:start + 8192])
+            self.assertEqual(self.speech_model.predict_stream(stream),
+                             self.speech_model.predict(self.create_file_storage(path)))
+
+    def test_concurrent_requests_are_batched(self):
+        # 동시 요청 결과가 단일 요청 결과와 같은지 테스트
+        expected = self.speech_model.predict(self.create_file_storage(self.positive_audio))
+
+        paths = [self.positive_audio, self.negative_audio] * 4
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            results = list(executor.map(
+                lambda path: self.speech_model.predict(self.create_file_storage(path)), paths))
+
+        for path, result in zip(paths, results):
+            if path == self.positive_audio:
+                self.assertAlmostEqual(result['score'], expected['score'], places=5)
+                self.assertEqual(result['stroke'], 1)
+            else:
+                self.assertEqual(result['stroke'], 0)
+
+    def test_int8_inference_mode(self):
+        model = SpeechModel(inference_mode='int8')
+        self.assertNotEqual(model.version, self.speech_model.version)
+        for path, stroke in [(self.positive_audio, 1), (self.negative_audio, 0)]:
+            result = model.predict(self.create_file_storage(path))
+            expected = self.speech_model.predict(self.create_file_storage(path))
+            self.assertEqual(result['stroke'], stroke)
+            self.assertAlmostEqual(result['score'], expected['score'], delta=2e-3)
+
+
+class TestSpeechInferenceParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = load_keras_model(SPEECH_MODEL_PATH)
+        cls.engine = KerasInference(cls.model)
+
+        audio = []
+        for name in ['positive_sample_audio.wav', 'negative_sample_audio.wav']:
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                audio.append(preprocess_audio(BytesIO(file.read())))
+        cls.audio = np.concatenate(audio)
+        # 기존 keras.Model.predict 결과 기준
+        cls.expected = cls.model.predict(cls.audio, verbose=0)
+
+    def test_traced_forward_matches_predict(self):
+        for i in range(len(self.audio)):
+            np.testing.assert_allclose(self.engine(self.audio[i:i + 1]), self.expected[i:i + 1],
+                                       rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(self.engine(self.audio), self.expected, rtol=1e-5, atol=1e-6)
+
+    def test_exported_saved_model_matches_predict(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = self.engine.export(os.path.join(tmp_dir, 'speech_model'), format='saved_model')
+            np.testing.assert_allclose(SavedModelInference(path)(self.audio), self.expected,
+                                       rtol=1e-5, atol=1e-6)
+
+    def test_exported_tflite_matches_predict(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = self.engine.export(os.path.join(tmp_dir, 'speech_model.tflite'), format='tflite')
+            engine = TFLiteInference(path)
+            np.testing.assert_allclose(engine(self.audio[:1]), self.expected[:1], rtol=1e-4, atol=1e-5)
+            np.testing.assert_allclose(engine(self.audio), self.expected, rtol=1e-4, atol=1e-5)
+
+    def test_folded_batch_norm_matches_predict(self):
+        folded = fold_batch_norm(self.model)
+        self.assertFalse(any(layer.__class__.__name__ == 'BatchNormalization' for layer in folded.layers))
+        np.testing.assert_allclose(KerasInference(folded)(self.audio), self.expected, rtol=1e-5, atol=1e-6)
+
+    def test_reduced_precision_keeps_predictions(self):
+        for quantization in ['float16', 'int8']:
+            with self.subTest(quantization=quantization):
+                engine = TFLiteInference(model_content=self.engine.to_tflite(quantization))
+                # 배치 크기가 바뀌어도 같은 결과
+                for scores in [engine(self.audio), engine(self.audio[:1]), engine(self.audio)]:
+                    np.testing.assert_allclose(scores, self.expected[:len(scores)], atol=2e-3)
+                    np.testing.assert_array_equal(scores > 0.5, self.expected[:len(scores)] > 0.5)
+
+    def test_quantized_tflite_is_smaller(self):
+        float32_size = len(self.engine.to_tflite())
+        self.assertLess(len(self.engine.to_tflite('float16')), 0.75 * float32_size)
+        self.assertLess(len(self.engine.to_tflite('int8')), 0.5 * float32_size)
+
+    def test_inference_mode_selects_engine(self):
+        self.assertIsInstance(load_speech_inference(SPEECH_MODEL_PATH, 'int8'), TFLiteInference)
+        with self.assertRaises(ValueError):
+            load_speech_inference(SPEECH_MODEL_PATH, 'int4')
+        with self.assertRaises(ValueError):
+            self.engine.export('speech_model', format='saved_model', quantization='int8')
+
+
+class TestBandEnergyRatio(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.signals = []
+        for name in ['positive_sample_audio.wav', 'negative_sample_audio.wav']:
+            y, sr = librosa.load(os.path.join(TEST_EXAMPLES_DIR, name), sr=None)
+            cls.signals.append(rms_normalize(librosa.resample(y, orig_sr=sr, target_sr=16000)))
+        cls.signals.append(np.random.default_rng(0).standard_normal(16000 * 5).astype(np.float32))
+
+    @staticmethod
+    def reference_ratio(audio):
+        # 기존 adaptive_preemphasis의 전체 STFT 기준
+        spec = np.abs(librosa.stft(audio))
+        return np.mean(spec[spec.shape[0]//2:]) / np.mean(spec[:spec.shape[0]//2])
+
+    def test_ratio_matches_full_stft(self):
+        for audio in self.signals:
+            self.assertAlmostEqual(band_energy_ratio(audio) / self.reference_ratio(audio), 1.0, delta=0.02)
+
+    def test_full_hop_is_exact(self):
+        for audio in self.signals:
+            self.assertAlmostEqual(band_energy_ratio(audio, hop_length=512) / self.reference_ratio(audio),
+                                   1.0, delta=1e-5)
+
+    @classmethod
+    def near_boundary_signal(cls, target):
+        """Low tone plus short noise bursts between the hop-1024 frames, with full-STFT ratio ~``target``."""
+        rng = np.random.default_rng(0)
+        n = 16000 * 2
+        tone = np.sin(2 * np.pi * 200 * np.arange(n) / 16000).astype(np.float32)
+        bursts = np.zeros(n, dtype=np.float32)
+        for center in range(512 + 1024 * 3, n - 1024, 1024 * 4):
+            bursts[center - 150:center + 150] = rng.standard_normal(300)
+        low, high = 0.0, 100.0
+        for _ in range(40):
+            gain = (low + high) / 2
+            if cls.reference_ratio(tone + gain * bursts) < target:
+                low = gain
+            else:
+                high = gain
+        return tone + high * bursts
+
+    def test_selects_same_alpha(self):
+        for audio in self.signals:
+            ratio = self.reference_ratio(audio)
+            expected = 0.97 if ratio < 0.1 else 0.95 if ratio < 0.3 else 0.90
+            _, alpha = adaptive_preemphasis(audio, sr=16000)
+            self.assertEqual(alpha, expected)
+
+    def test_selects_same_alpha_near_boundaries(self):
+        # hop 1024 추정치는 이 신호들에서 경계 반대편으로 넘어감
+        for bound in [0.1, 0.3]:
+            for target in [bound * 1.002, bound * 0.998]:
+                with self.subTest(target=target):
+                    audio = self.near_boundary_signal(target)
+                    ratio = self.reference_ratio(audio)
+                    self.assertAlmostEqual(ratio / target, 1.0, delta=1e-4)
+                    expected = 0.97 if ratio < 0.1 else 0.95 if ratio < 0.3 else 0.90
+                    _, alpha = adaptive_preemphasis(audio, sr=16000)
+                    self.assertEqual(alpha, expected)
+                    _, alpha = adaptive_preemphasis(audio, sr=16000, freq_ratio=band_energy_ratio(audio))
+                    self.assertEqual(alpha, expected)
+
+
+class TestMFCCExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.extractor = MFCCExtractor()
+        clips = []
+        for name in ['positive_sample_audio.wav', 'negative_sample_audio.wav']:
+            y, _ = librosa.load(os.path.join(TEST_EXAMPLES_DIR, name), sr=16000)
+            clips.append(np.pad(y, (0, max(0, 320000 - len(y))))[:320000])
+        cls.clips = np.stack(clips)
+
+    def test_matches_librosa(self):
+        for y in self.clips:
+            expected = librosa.feature.mfcc(y=y, sr=16000, n_mfcc=13, hop_length=512)
+            mfcc = self.extractor(y)
+            self.assertEqual(mfcc.shape, (13, 626))
+            np.testing.assert_allclose(mfcc, expected, rtol=1e-4, atol=5e-3)
+
+    def test_batch_matches_single_clips(self):
+        batch = self.extractor(self.clips)
+        self.assertEqual(batch.shape, (2, 13, 626))
+        for i, y in enumerate(self.clips):
+            np.testing.assert_allclose(batch[i], self.extractor(y), rtol=1e-6, atol=1e-5)
+
+    def test_skipping_padded_frames_is_exact(self):
+        rng = np.random.default_rng(0)
+        for length in [1, 700, 4000, 16000 * 4, 319999]:
+            y = np.zeros(320000, dtype=np.float32)
+            y[:length] = rng.standard_normal(length)
+            np.testing.assert_array_equal(self.extractor(y, length=length), self.extractor(y))
+
+        clips = self.clips.copy()
+        clips[1, 16000 * 3:] = 0
+        np.testing.assert_array_equal(self.extractor(clips, length=[320000, 16000 * 3]), self.extractor(clips))
+
+    def test_rejects_wrong_length(self):
+        with self.assertRaises(ValueError):
+            self.extractor(np.zeros(16000, dtype=np.float32))
+
+
+class TestNonsilentIntervals(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.signals = []
+        for name in ['positive_sample_audio.wav', 'negative_sample_audio.wav']:
+            y, sr = librosa.load(os.path.join(TEST_EXAMPLES_DIR, name), sr=None)
+            cls.signals.append(adaptive_preemphasis(rms_normalize(resample(y, sr)), sr=16000)[0])
+        for length in [100, 5000, 48017]:
+            envelope = np.repeat(rng.uniform(0, 1, length // 512 + 1) ** 3, 512)[:length]
+            cls.signals.append((rng.standard_normal(length) * envelope).astype(np.float32))
+        cls.signals.append(np.zeros(4000, dtype=np.float32))
+
+    def test_matches_librosa_split(self):
+        for y in self.signals:
+            for top_db in [20, 60]:
+                np.testing.assert_array_equal(nonsilent_intervals(y, top_db=top_db),
+                                              librosa.effects.split(y, top_db=top_db))
+
+    def test_frames_at_the_threshold(self):
+        # 임계값이 프레임 RMS와 정확히 같은 경우
+        y = self.signals[-2]
+        db = librosa.amplitude_to_db(librosa.feature.rms(y=y)[0], ref=np.max, top_db=None)
+        for frame in range(0, len(db), 7):
+            for top_db in [-float(db[frame]), np.nextafter(-float(db[frame]), 0)]:
+                np.testing.assert_array_equal(nonsilent_intervals(y, top_db=top_db),
+                                              librosa.effects.split(y, top_db=top_db))
+
+
+class TestSpeechStream(unittest.TestCase):
+    @staticmethod
+    def stream(data, chunk_size):
+        stream = SpeechStream()
+        for start in range(0, len(data), chunk_size):
+            stream.feed(data[start:start + chunk_size])
+        return stream.finish()
+
+    @staticmethod
+    def encode(sr, subtype, format='WAV'):
+        signal = np.clip(np.random.default_rng(0).standard_normal((30000, 2)) * 0.3, -1, 1)
+        buffer = BytesIO()
+        sf.write(buffer, signal, sr, format=format, subtype=subtype)
+        return buffer.getvalue()
+
+    def test_sample_wavs_match_preprocess_audio(self):
+        for name in ['positive_sample_audio.wav', 'negative_sample_audio.wav']:
+            with open(os.path.join(TEST_EXAMPLES_DIR, name), 'rb') as file:
+                data = file.read()
+            expected = preprocess_audio(BytesIO(data))
+            for chunk_size in [999, 65536, len(data)]:
+                with self.subTest(name=name, chunk_size=chunk_size):
+                    np.testing.assert_array_equal(self.stream(data, chunk_size), expected)
+
+    def test_near_alpha_boundary_matches_preprocess_audio(self):
+        for bound in [0.1, 0.3]:
+            for target in [bound * 1.002, bound * 0.998]:
+                with self.subTest(target=target):
+                    buffer = BytesIO()
+                    sf.write(buffer, TestBandEnergyRatio.near_boundary_signal(target), 16000, format='WAV',
+                             subtype='FLOAT')
+                    data = buffer.getvalue()
+                    np.testing.assert_array_equal(self.stream(data, 4096), preprocess_audio(BytesIO(data)))
+
+    def test_formats_and_sample_rates(self):
+        for sr in [8000, 16000, 22050]:
+            for subtype in ['PCM_16', 'PCM_24', 'FLOAT']:
+                with self.subTest(sr=sr, subtype=subtype):
+                    data = self.encode(sr, subtype)
+                    np.testing.assert_array_equal(self.stream(data, 777), preprocess_audio(BytesIO(data)))
+
+    def test_unknown_data_size(self):
+        # 녹음 중인 WAV는 data 크기를 0xFFFFFFFF로 기록
+        data = bytearray(self.encode(16000, 'PCM_16'))
+        data[data.index(b'data') + 4:data.index(b'data') + 8] = b'\xff\xff\xff\xff'
+        np.testing.assert_array_equal(self.stream(bytes(data), 4096),
+                                      preprocess_audio(BytesIO(self.encode(16000, 'PCM_16'))))
+
+    def test_other_formats_are_buffered(self):
+        data = self.encode(22050, 'PCM_16', format='FLAC')
+        np.testing.assert_array_equal(self.stream(data, 1000), preprocess_audio(BytesIO(data)))
+
+    def test_empty_stream(self):
+        with self.assertRaises(ValueError):
+            SpeechStream().finish()
+
+
+class TestWavReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.signal = np.clip(rng.standard_normal((4000, 3)) * 0.3, -1, 1)
+
+    def encode(self, channels, subtype, format='WAV', sr=22050):
+        buffer = BytesIO()
+        sf.write(buffer, self.signal[:, :channels], sr, format=format, subtype=subtype)
+        return buffer.getvalue()
+
+    def test_matches_librosa_load(self):
+        for format in ['WAV', 'WAVEX']:
+            for subtype in ['PCM_U8', 'PCM_16', 'PCM_24', 'PCM_32', 'FLOAT', 'DOUBLE']:
+                for channels in [1, 2]:
+                    with self.subTest(format=format, subtype=subtype, channels=channels):
+                        data = self.encode(channels, subtype, format)
+                        expected, expected_sr = librosa.load(BytesIO(data), sr=None)
+                        audio, sr = read_wav(data)
+                        self.assertEqual(sr, expected_sr)
+                        self.assertEqual(audio.dtype, np.float32)
+                        np.testing.assert_array_equal(audio, expected)
+
+    def test_sample_wav_matches_librosa_load(self):
+        with open(os.path.join(TEST_EXAMPLES_DIR, 'negative_sample_audio.wav'), 'rb') as file:
+            data = file.read()
+        expected, expected_sr = librosa.load(BytesIO(data), sr=None)
+        audio, sr = read_wav(data)
+        self.assertEqual(sr, expected_sr)
+        np.testing.assert_array_equal(audio, expected)
+
+    def test_other_formats_fall_back_to_librosa(self):
+        buffer = BytesIO()
+        sf.write(buffer, self.signal[:, :1], 22050, format='FLAC')
+        data = buffer.getvalue()
+        self.assertIsNone(read_wav(data))
+
+        audio, sr = load_audio(data)
+        expected, expected_sr = librosa.load(BytesIO(data), sr=None)
+        self.assertEqual(sr, expected_sr)
+        np.testing.assert_array_equal(audio, expected)
+
+    def test_16khz_skips_resampling(self):
+        audio, sr = read_wav(self.encode(1, 'PCM_16', sr=16000))
+        self.assertIs(resample(audio, sr), audio)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_concurrent_samples(self):
+        batch_sizes = []
+        release = threading.Event()
+
+        def infer(batch):
+            release.wait()
+            batch_sizes.append(len(batch))
+            return batch * 2
+
+        batcher = MicroBatcher(infer, max_batch_size=4, max_wait_ms=200)
+        try:
+            futures = [batcher.submit(np.full((1, 3), i, dtype=np.float32)) for i in range(4)]
+            release.set()
+            for i, future in enumerate(futures):
+                np.testing.assert_array_equal(future.result(), np.full((1, 3), 2 * i))
+        finally:
+            batcher.close()
+
+        self.assertEqual(batch_sizes, [4])
+
+    def test_errors_propagate_to_every_caller(self):
+        def infer(batch):
+            raise RuntimeError("inference failed")
+
+        batcher = MicroBatcher(infer, max_batch_size=2, max_wait_ms=1)
+        try:
+            with self.assertRaises(RuntimeError):
+                batcher.predict(np.zeros((1, 3)))
+        finally:
+            batcher.close()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file